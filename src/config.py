@@ -7,9 +7,42 @@ load_dotenv()
 # OpenAI Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_MODEL = "gpt-4o-mini"
+# Stronger model that re-reads fields the deterministic checks flag as suspect
+OPENAI_STRONG_MODEL = "gpt-4o"
+CASCADE_ENABLED = True
+CASCADE_SAMPLE_TEMPERATURE = 0.7  # tie-break sample when the first two reads disagree
 
 
 MONEY_TOLERANCE = 1.0
 COUNTY_MATCH_THRESHOLD = 0.8  
 
 COUNTIES_FILE = "counties.json"
+
+# Append-only store of every extraction (JSON lines)
+EXTRACTION_STORE_FILE = "extractions.jsonl"
+
+# Duplicate detection
+NEAR_DUPLICATE_THRESHOLD = 0.9
+DUPLICATE_RECORDING_WINDOW_DAYS = 90
+
+# Layout templates induced from LLM extractions
+TEMPLATE_STORE_FILE = "templates.json"
+TEMPLATE_MIN_OBSERVATIONS = 3
+TEMPLATE_MIN_AGREEMENT = 0.98
+TEMPLATE_AUDIT_EVERY = 20  # every Nth local extraction is re-checked by the LLM
+TEMPLATE_SAVE_EVERY = 50  # observations between templates.json snapshots
+
+# Stream the extraction and run checks on partial results, cancelling on a certain failure
+STREAM_EXTRACTION = False
+
+# Durable job queue (SQLite); keep the file on a volume every worker host can lock
+JOB_QUEUE_FILE = "jobs.db"
+JOB_LEASE_SECONDS = 300
+JOB_MAX_ATTEMPTS = 3
+
+# Deadline-aware scheduler
+SCHEDULER_LLM_WORKERS = 4
+SCHEDULER_CPU_WORKERS = 2
+SCHEDULER_RESERVED_LLM = 1  # LLM slots only urgent deeds may use
+SCHEDULER_URGENT_WINDOW_SECONDS = 3600  # a deadline closer than this makes a deed urgent
+SCHEDULER_URGENT_PRIORITY = 10  # so does a priority at or above this
@@ -0,0 +1,162 @@
+# Duplicate detection: reuse extractions of rescanned/resubmitted deeds and flag parcels recorded twice.
+
+import hashlib
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from src.config import NEAR_DUPLICATE_THRESHOLD, DUPLICATE_RECORDING_WINDOW_DAYS
+from src.dedup.minhash import NUM_PERMUTATIONS, LSHIndex, estimate_jaccard, minhash_signature, normalize_ocr_text
+from src.enrich.normalizer import OCR_CONFUSIONS
+from src.models import DedupMatch, ExtractedDeed, ExtractionRecord
+from src.store.extractions import ExtractionStore, get_extraction_store
+from src.utils.dates import parse_date
+from src.validate.errors import DuplicateRecordingError
+
+
+_RESCAN_FOLD = str.maketrans(OCR_CONFUSIONS)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def rescan_form(text: str) -> str:
+    # Text with whitespace dropped and OCR-confused characters folded; punctuation is kept,
+    # so "$12,500.00" and "$1,250,000" stay apart.
+    return _WHITESPACE.sub('', text.lower().translate(_RESCAN_FOLD))
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DedupIndex:
+    # Pre-extraction index. Exact and rescan copies (same text up to whitespace and OCR-confused
+    # characters) reuse the earlier extraction; MinHash/LSH near matches are only reported, because
+    # a resubmission with an edited amount, party or county must be extracted and validated again.
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self._exact: Dict[str, ExtractionRecord] = {}
+        self._rescan: Dict[str, str] = {}
+        self._signatures: Dict[str, List[int]] = {}
+        self._lsh = LSHIndex()
+        # Extractions run on several threads under the scheduler
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _exact_key(raw_text: str) -> str:
+        return _sha256(normalize_ocr_text(raw_text))
+
+    def add(self, record: ExtractionRecord) -> None:
+        raw_text = record.provenance.raw_text
+        key = self._exact_key(raw_text)
+        rescan_key = _sha256(rescan_form(raw_text))
+        stored = record.provenance.minhash
+        # Records written before signatures were stored, or with other MinHash parameters, are hashed here
+        signature = stored if stored and len(stored) == NUM_PERMUTATIONS else minhash_signature(raw_text)
+        with self._lock:
+            self._exact[key] = record
+            self._rescan[rescan_key] = key
+            self._signatures[key] = signature
+            self._lsh.add(key, signature)
+
+    def find(self, raw_text: str) -> Optional[DedupMatch]:
+        with self._lock:
+            exact = self._exact.get(self._exact_key(raw_text))
+        if exact is not None:
+            return DedupMatch(record=exact, kind="exact", similarity=1.0)
+
+        signature = minhash_signature(raw_text)
+        rescan_key = _sha256(rescan_form(raw_text))
+        with self._lock:
+            rescan = self._rescan.get(rescan_key)
+            if rescan is not None:
+                similarity = estimate_jaccard(signature, self._signatures[rescan])
+                return DedupMatch(record=self._exact[rescan], kind="rescan", similarity=similarity)
+
+            best: Optional[DedupMatch] = None
+            for key in self._lsh.candidates(signature):
+                similarity = estimate_jaccard(signature, self._signatures[key])
+                if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                    best = DedupMatch(record=self._exact[key], kind="near", similarity=similarity)
+        return best
+
+
+def _normalize_apn(apn: str) -> str:
+    return re.sub(r'[^0-9A-Z]', '', apn.upper())
+
+
+class ParcelIndex:
+    # Post-extraction index of doc/apn: the same parcel recorded by different docs within a window is flagged.
+
+    def __init__(self, window_days: int = DUPLICATE_RECORDING_WINDOW_DAYS):
+        self.window_days = window_days
+        self._by_apn: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, deed: ExtractedDeed) -> None:
+        with self._lock:
+            self._by_apn.setdefault(_normalize_apn(deed.apn), {})[deed.doc] = deed.date_recorded
+
+    def check(self, deed: ExtractedDeed) -> Optional[DuplicateRecordingError]:
+        try:
+            recorded = parse_date(deed.date_recorded)
+        except ValueError:
+            return None
+
+        with self._lock:
+            recordings = list(self._by_apn.get(_normalize_apn(deed.apn), {}).items())
+        for other_doc, other_recorded in recordings:
+            if other_doc == deed.doc:
+                continue  # resubmission of the same document
+            try:
+                gap = abs((recorded - parse_date(other_recorded)).days)
+            except ValueError:
+                continue
+            if gap <= self.window_days:
+                return DuplicateRecordingError(
+                    f"Parcel {deed.apn} is already recorded by {other_doc} on {other_recorded}, "
+                    f"{gap} days from this recording ({deed.date_recorded}). "
+                    f"The same parcel recorded twice within {self.window_days} days is a potential fraud."
+                )
+        return None
+
+
+class StoreIndexes:
+    # Dedup and parcel indexes that follow the extraction store, so records appended by other
+    # worker processes (or hosts sharing the store) are seen before the next lookup.
+
+    def __init__(self, store: ExtractionStore):
+        self.store = store
+        self.dedup, self.parcels = DedupIndex(), ParcelIndex()
+        self.offset = 0
+        self._lock = threading.Lock()
+
+    def sync(self) -> Tuple[DedupIndex, ParcelIndex]:
+        # Returns the indexes as of this sync.
+        with self._lock:
+            if self.store.size() < self.offset:
+                # The store was replaced: start over
+                self.dedup, self.parcels, self.offset = DedupIndex(), ParcelIndex(), 0
+            for record, self.offset in self.store.read_from(self.offset):
+                self.dedup.add(record)
+                self.parcels.add(record.deed)
+            return self.dedup, self.parcels
+
+
+def build_indexes(store: ExtractionStore) -> Tuple[DedupIndex, ParcelIndex]:
+    return StoreIndexes(store).sync()
+
+
+_indexes_instance: Optional[StoreIndexes] = None
+_instance_lock = threading.Lock()
+
+
+def get_dedup_indexes() -> Tuple[DedupIndex, ParcelIndex]:
+    # Built from the extraction store on first use, then caught up with new appends on every call.
+    global _indexes_instance
+
+    with _instance_lock:
+        if _indexes_instance is None:
+            _indexes_instance = StoreIndexes(get_extraction_store())
+
+    return _indexes_instance.sync()
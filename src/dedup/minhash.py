@@ -0,0 +1,67 @@
+# MinHash signatures and LSH banding over character shingles, pure Python, no external dependencies.
+
+import hashlib
+import random
+import re
+from typing import Dict, List, Set
+
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard become candidates
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_rng = random.Random(42)
+_PERMUTATIONS = [
+    (_rng.randint(1, _MERSENNE_PRIME - 1), _rng.randint(0, _MERSENNE_PRIME - 1))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+def normalize_ocr_text(text: str) -> str:
+    # Lowercase and collapse whitespace so rescans that only differ in spacing compare equal.
+    return re.sub(r'\s+', ' ', text.lower()).strip()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    text = normalize_ocr_text(text)
+    if len(text) < size:
+        text = text.ljust(size)
+    return {
+        int.from_bytes(hashlib.blake2b(text[i:i + size].encode("utf-8"), digest_size=4).digest(), "big")
+        for i in range(len(text) - size + 1)
+    }
+
+
+def minhash_signature(text: str) -> List[int]:
+    hashed = shingles(text)
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashed)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def estimate_jaccard(sig1: List[int], sig2: List[int]) -> float:
+    return sum(1 for x, y in zip(sig1, sig2) if x == y) / len(sig1)
+
+
+class LSHIndex:
+    def __init__(self, bands: int = LSH_BANDS):
+        self.bands = bands
+        self.rows = NUM_PERMUTATIONS // bands
+        self._buckets: List[Dict[tuple, Set[str]]] = [{} for _ in range(bands)]
+
+    def _band_keys(self, signature: List[int]):
+        for band in range(self.bands):
+            yield band, tuple(signature[band * self.rows:(band + 1) * self.rows])
+
+    def add(self, key: str, signature: List[int]) -> None:
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, set()).add(key)
+
+    def candidates(self, signature: List[int]) -> Set[str]:
+        found: Set[str] = set()
+        for band, band_key in self._band_keys(signature):
+            found |= self._buckets[band].get(band_key, set())
+        return found
@@ -1,13 +1,15 @@
 # County name resolution with fuzzy matching, This module handles the challenge of mapping messy OCR county names
 
 import json
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 from src.models import County
-from src.enrich.normalizer import normalize_county_name, expand_abbreviations
+from src.enrich.normalizer import CountyIndex, normalize_county_name, expand_abbreviations
+from src.enrich.rate_store import TaxRateStore
+from src.utils.dates import parse_date
 from src.utils.similarity import find_best_match
-from src.validate.errors import CountyMatchError
+from src.validate.errors import CountyMatchError, TaxRateError
 
 
 # Confidence threshold for fuzzy matching
@@ -29,16 +31,43 @@ def load_counties(counties_file: str = "counties.json") -> List[County]:
     return [County(**item) for item in data]
 
 
+# Reference data is parsed once per process, not once per document
+_reference_cache: Dict[str, Tuple[List[County], TaxRateStore, CountyIndex]] = {}
+# Most recent ad-hoc county list and its index; the reference keeps the list alive, so identity is safe
+_adhoc_index: Optional[Tuple[List[County], CountyIndex]] = None
+
+
+def get_reference_data(counties_file: str = "counties.json") -> Tuple[List[County], TaxRateStore]:
+    if counties_file not in _reference_cache:
+        counties = load_counties(counties_file)
+        _reference_cache[counties_file] = (counties, TaxRateStore.from_counties(counties), CountyIndex(counties))
+    counties, rate_store, _ = _reference_cache[counties_file]
+    return counties, rate_store
+
+
+def get_county_index(counties: List[County]) -> CountyIndex:
+    # Variant tables are built once with the reference data and reused for every document.
+    global _adhoc_index
+
+    for cached, _, index in _reference_cache.values():
+        if cached is counties:
+            return index
+    if _adhoc_index is None or _adhoc_index[0] is not counties:
+        _adhoc_index = (counties, CountyIndex(counties))
+    return _adhoc_index[1]
+
+
 def resolve_county(county_raw: str, counties: List[County], threshold: float = MATCH_CONFIDENCE_THRESHOLD) -> Tuple[str, float, float]:
     # Resolve raw county name to canonical name with tax rate.
+    # Exact spellings and known OCR variants resolve by hash lookup; fuzzy scoring is the fallback.
+    hit = get_county_index(counties).lookup(county_raw)
+    if hit is not None and hit[1] >= threshold:
+        county, confidence = hit
+        return county.name, county.tax_rate, confidence
+
     normalized = normalize_county_name(county_raw)
     expanded = expand_abbreviations(county_raw)
 
-    for county in counties:
-        county_normalized = normalize_county_name(county.name)
-        if expanded == county_normalized:
-            return county.name, county.tax_rate, 1.0
-
     county_names = [c.name for c in counties]
     best_match, confidence = find_best_match(
         expanded,
@@ -59,15 +88,35 @@ def resolve_county(county_raw: str, counties: List[County], threshold: float = M
     return best_match, tax_rate, confidence
 
 
-def enrich_with_county(extracted_deed, counties: List[County]):
-    # Enrich extracted deed with county information.
+def enrich_with_county(
+    extracted_deed,
+    counties: List[County],
+    rate_store: Optional[TaxRateStore] = None,
+    resolved: Optional[Tuple[str, float, float]] = None,
+):
+    # Enrich extracted deed with county information, using the rate in force on the recording date.
+    # resolved: resolve_county's result for this county_raw, when it was already made (streaming checks).
     from src.models import EnrichedDeed
 
-    canonical_name, tax_rate, confidence = resolve_county(
+    canonical_name, tax_rate, confidence = resolved or resolve_county(
         extracted_deed.county_raw,
         counties
     )
 
+    if rate_store is not None:
+        try:
+            recorded = parse_date(extracted_deed.date_recorded)
+        except ValueError:
+            recorded = None  # the date check reports this; keep the current rate
+        if recorded is not None:
+            dated_rate = rate_store.rate_on(extracted_deed.state, canonical_name, recorded)
+            if dated_rate is None:
+                raise TaxRateError(
+                    f"No tax rate for {canonical_name}, {extracted_deed.state} "
+                    f"effective on {extracted_deed.date_recorded}."
+                )
+            tax_rate = dated_rate
+
     enriched = EnrichedDeed(
         **extracted_deed.model_dump(),
         county_canonical=canonical_name,
@@ -1,10 +1,13 @@
 # Text normalization utilities for county name matching, this module handles abbreviation expansion and text cleaning.
 import re
-from typing import Dict
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+
+from src.models import County
 
 # Common abbreviations in county names
 ABBREVIATIONS: Dict[str, str] = {
-    "s.": "santa", 
+    "s.": "santa",
     "st.": "saint",
     "mt.": "mount",
     "n.": "north",
@@ -13,28 +16,76 @@ ABBREVIATIONS: Dict[str, str] = {
     "ft.": "fort",
 }
 
+# Confidence reported for a name that only matched after folding OCR confusions
+OCR_VARIANT_CONFIDENCE = 0.95
+
+_WHITESPACE = re.compile(r'\s+')
+
+# One pass: a standalone abbreviation is expanded, any other '.' is dropped
+_ABBREVIATION_PATTERN = re.compile(
+    r'(?<!\S)(?:' + '|'.join(re.escape(abbr) for abbr in ABBREVIATIONS) + r')(?!\S)|\.'
+)
+
+# Characters OCR confuses with each other; no two digits share a folded form
+OCR_CONFUSIONS = {"0": "o", "1": "l", "i": "l", "4": "a", "5": "s", "8": "b"}
+
+# OCR confusions folded to one representative; spaces and punctuation are dropped
+_OCR_FOLD = str.maketrans(
+    {**OCR_CONFUSIONS, " ": None, ".": None, ",": None, "-": None, "'": None, "|": None}
+)
+
+_COUNTY_SUFFIXES = ("", " county", " co.")
+
+
 def normalize_county_name(name: str) -> str:
     # Normalize county name for matching.
-    name = name.lower()
-    name = re.sub(r'\s+', ' ', name).strip()
-    name = name.replace('|', '').strip()
-
-    return name
+    return _WHITESPACE.sub(' ', name.lower().replace('|', '')).strip()
 
 def expand_abbreviations(name: str) -> str:
     # Expand common abbreviations in county names.
-    name = normalize_county_name(name)
-    words = name.split()
-    expanded_words = []
-
-    for word in words:
-        if word in ABBREVIATIONS:
-            expanded_words.append(ABBREVIATIONS[word])
-        else:
-            word_clean = word.replace('.', '')
-            if word.endswith('.') and word in ABBREVIATIONS:
-                expanded_words.append(ABBREVIATIONS[word])
-            else:
-                expanded_words.append(word_clean)
-
-    return ' '.join(expanded_words)
+    return _ABBREVIATION_PATTERN.sub(
+        lambda m: ABBREVIATIONS.get(m.group(0), ''),
+        normalize_county_name(name)
+    )
+
+def ocr_skeleton(name: str) -> str:
+    # Fold 0/O, 1/l/I, 4/A, 5/S, 8/B and drop spaces, so "Sant4 C1ara" and "SantaClara" share a key.
+    return name.lower().translate(_OCR_FOLD)
+
+
+def _spellings(name: str) -> List[str]:
+    # Every way the canonical name may be written: full words, abbreviations, optional "county" suffix.
+    full_to_abbr: Dict[str, List[str]] = {}
+    for abbr, full in ABBREVIATIONS.items():
+        full_to_abbr.setdefault(full, []).append(abbr)
+
+    choices = [[word] + full_to_abbr.get(word, []) for word in normalize_county_name(name).split()]
+    return [' '.join(words) + suffix for words in product(*choices) for suffix in _COUNTY_SUFFIXES]
+
+
+class CountyIndex:
+    # Precomputed spelling and OCR-variant tables for a county list, built once and probed by hash lookup.
+
+    def __init__(self, counties: List[County]):
+        self.counties = counties
+        self._exact: Dict[str, County] = {}
+        self._ocr: Dict[str, Optional[County]] = {}
+
+        for county in counties:
+            for spelling in _spellings(county.name):
+                self._exact.setdefault(expand_abbreviations(spelling), county)
+                key = ocr_skeleton(spelling)
+                existing = self._ocr.get(key, county)
+                # A variant shared by two counties is ambiguous and left to fuzzy matching
+                self._ocr[key] = county if existing is county else None
+
+    def lookup(self, county_raw: str) -> Optional[Tuple[County, float]]:
+        county = self._exact.get(expand_abbreviations(county_raw))
+        if county is not None:
+            return county, 1.0
+
+        county = self._ocr.get(ocr_skeleton(county_raw))
+        if county is not None:
+            return county, OCR_VARIANT_CONFIDENCE
+
+        return None
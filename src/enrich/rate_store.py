@@ -0,0 +1,90 @@
+# Effective-dated county tax rates, flattened into sorted arrays for binary-search lookup.
+
+from array import array
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.models import County
+from src.utils.dates import parse_date
+
+_ALWAYS = date.min.toordinal()
+
+_STATE_CODES = {
+    "ALABAMA": "AL", "ALASKA": "AK", "ARIZONA": "AZ", "ARKANSAS": "AR", "CALIFORNIA": "CA",
+    "COLORADO": "CO", "CONNECTICUT": "CT", "DELAWARE": "DE", "DISTRICT OF COLUMBIA": "DC",
+    "FLORIDA": "FL", "GEORGIA": "GA", "HAWAII": "HI", "IDAHO": "ID", "ILLINOIS": "IL",
+    "INDIANA": "IN", "IOWA": "IA", "KANSAS": "KS", "KENTUCKY": "KY", "LOUISIANA": "LA",
+    "MAINE": "ME", "MARYLAND": "MD", "MASSACHUSETTS": "MA", "MICHIGAN": "MI", "MINNESOTA": "MN",
+    "MISSISSIPPI": "MS", "MISSOURI": "MO", "MONTANA": "MT", "NEBRASKA": "NE", "NEVADA": "NV",
+    "NEW HAMPSHIRE": "NH", "NEW JERSEY": "NJ", "NEW MEXICO": "NM", "NEW YORK": "NY",
+    "NORTH CAROLINA": "NC", "NORTH DAKOTA": "ND", "OHIO": "OH", "OKLAHOMA": "OK", "OREGON": "OR",
+    "PENNSYLVANIA": "PA", "RHODE ISLAND": "RI", "SOUTH CAROLINA": "SC", "SOUTH DAKOTA": "SD",
+    "TENNESSEE": "TN", "TEXAS": "TX", "UTAH": "UT", "VERMONT": "VT", "VIRGINIA": "VA",
+    "WASHINGTON": "WA", "WEST VIRGINIA": "WV", "WISCONSIN": "WI", "WYOMING": "WY",
+}
+_KNOWN_CODES = set(_STATE_CODES.values())
+
+
+def normalize_state(state: Optional[str]) -> str:
+    # "CA ", "ca", "C.A." and "California" all become "CA"; anything unrecognized is kept cleaned up.
+    cleaned = " ".join((state or "").replace(".", "").upper().split())
+    return _STATE_CODES.get(cleaned, cleaned)
+
+
+def _key(state: Optional[str], county: str) -> Tuple[str, str]:
+    return normalize_state(state), county.lower()
+
+
+class TaxRateStore:
+    # One contiguous (effective ordinal, rate) run per (state, county), sorted by effective date.
+
+    def __init__(self):
+        self._spans: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        # county -> states it is loaded for, to resolve deeds whose state is missing or unreadable
+        self._states: Dict[str, List[str]] = {}
+        self._effective = array('l')
+        self._rates = array('d')
+
+    @classmethod
+    def from_counties(cls, counties: List[County]) -> "TaxRateStore":
+        store = cls()
+        for county in counties:
+            if county.rates:
+                history = sorted(
+                    (parse_date(r.effective_from).toordinal(), r.tax_rate) for r in county.rates
+                )
+            else:
+                history = [(_ALWAYS, county.tax_rate)]
+
+            start = len(store._effective)
+            for effective, rate in history:
+                store._effective.append(effective)
+                store._rates.append(rate)
+            key = _key(county.state, county.name)
+            store._spans[key] = (start, len(store._effective))
+            store._states.setdefault(key[1], []).append(key[0])
+        return store
+
+    def __len__(self) -> int:
+        return len(self._effective)
+
+    def rate_on(self, state: Optional[str], county: str, on: Union[date, str]) -> Optional[float]:
+        # Rate in force on the given day, or None if the county is unknown or the date predates its history.
+        # Rows loaded without a state match a county of that name in any state, and a deed whose
+        # state is missing or not a state code matches a county name loaded for a single state.
+        state, county = _key(state, county)
+        span = self._spans.get((state, county)) or self._spans.get(("", county))
+        if span is None and state not in _KNOWN_CODES:
+            states = self._states.get(county, [])
+            if len(states) == 1:
+                span = self._spans[(states[0], county)]
+        if span is None:
+            return None
+        if isinstance(on, str):
+            on = parse_date(on)
+        start, end = span
+        idx = bisect_right(self._effective, on.toordinal(), start, end)
+        if idx == start:
+            return None
+        return self._rates[idx - 1]
@@ -0,0 +1,173 @@
+# Durable SQLite job queue with lease/ack semantics and per-stage checkpoints.
+
+import hashlib
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.config import JOB_QUEUE_FILE, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS
+from src.models import Job
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    doc_key TEXT NOT NULL UNIQUE,
+    raw_text TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    priority INTEGER NOT NULL DEFAULT 0,
+    deadline REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, lease_expires);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    job_id INTEGER NOT NULL REFERENCES jobs (id),
+    stage TEXT NOT NULL,
+    output TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (job_id, stage)
+);
+"""
+
+
+class JobQueue:
+    # Job states: pending -> leased -> done | failed. An expired lease makes the job
+    # available again, so work held by a crashed worker is picked up by another one.
+
+    def __init__(
+        self,
+        path: str = JOB_QUEUE_FILE,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+    ):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # Autocommit; write transactions are opened explicitly with BEGIN IMMEDIATE.
+        # The default rollback journal is kept because WAL does not work on network filesystems.
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "deadline" not in columns:  # queue file created before scheduling existed
+            self._conn.executescript(
+                "ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0;"
+                "ALTER TABLE jobs ADD COLUMN deadline REAL;"
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _write(self, sql: str, params: tuple = ()) -> int:
+        return self._conn.execute(sql, params).rowcount
+
+    def enqueue(self, raw_text: str, priority: int = 0, deadline: Optional[float] = None) -> Tuple[int, bool]:
+        # The same OCR text is only ever queued once; returns (job id, newly added).
+        doc_key = hashlib.sha256(raw_text.encode("utf-8")).hexdigest()
+        now = time.time()
+        added = self._write(
+            "INSERT OR IGNORE INTO jobs (doc_key, raw_text, priority, deadline, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (doc_key, raw_text, priority, deadline, now, now),
+        )
+        job_id = self._conn.execute("SELECT id FROM jobs WHERE doc_key = ?", (doc_key,)).fetchone()[0]
+        return job_id, bool(added)
+
+    def lease(self, worker_id: str) -> Optional[Job]:
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            # A job whose worker keeps dying with it is failed instead of retried forever
+            self._write(
+                "UPDATE jobs SET status = 'failed', error = 'lease expired on final attempt', "
+                "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            # Earliest deadline first, then higher priority; jobs without a deadline go last
+            row = self._conn.execute(
+                "SELECT id, doc_key, raw_text, attempts FROM jobs "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY deadline IS NULL, deadline, priority DESC, id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                self._conn.execute("COMMIT")
+                return None
+            self._write(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker_id, now + self.lease_seconds, now, row[0]),
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return Job(id=row[0], doc_key=row[1], raw_text=row[2], attempts=row[3] + 1)
+
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        # Extend the lease; False means it was lost to another worker.
+        now = time.time()
+        return self._write(
+            "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (now + self.lease_seconds, now, job_id, worker_id),
+        ) == 1
+
+    def checkpoint(self, job_id: int, stage: str, output: str, worker_id: Optional[str] = None) -> bool:
+        # With a worker_id, only written while that worker still holds the lease.
+        if worker_id is None:
+            return self._write(
+                "INSERT OR REPLACE INTO checkpoints (job_id, stage, output, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, stage, output, time.time()),
+            ) == 1
+        return self._write(
+            "INSERT OR REPLACE INTO checkpoints (job_id, stage, output, created_at) "
+            "SELECT ?, ?, ?, ? WHERE EXISTS "
+            "(SELECT 1 FROM jobs WHERE id = ? AND status = 'leased' AND lease_owner = ?)",
+            (job_id, stage, output, time.time(), job_id, worker_id),
+        ) == 1
+
+    def get_checkpoint(self, job_id: int, stage: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT output FROM checkpoints WHERE job_id = ? AND stage = ?", (job_id, stage)
+        ).fetchone()
+        return row[0] if row else None
+
+    def ack(self, job_id: int, worker_id: str, result: str) -> bool:
+        return self._write(
+            "UPDATE jobs SET status = 'done', result = ?, lease_owner = NULL, lease_expires = NULL, "
+            "updated_at = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (result, time.time(), job_id, worker_id),
+        ) == 1
+
+    def nack(self, job_id: int, worker_id: str, error: str, result: Optional[str] = None) -> bool:
+        # Give the job back for a retry, or fail it for good once it has used all its attempts.
+        return self._write(
+            "UPDATE jobs SET "
+            "status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "result = CASE WHEN attempts >= ? THEN ? ELSE result END, "
+            "error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (self.max_attempts, self.max_attempts, result, error, time.time(), job_id, worker_id),
+        ) == 1
+
+    def fail(self, job_id: int, worker_id: str, error: str, result: Optional[str] = None) -> bool:
+        # Fail the job for good, without using up its remaining attempts.
+        return self._write(
+            "UPDATE jobs SET status = 'failed', result = ?, error = ?, lease_owner = NULL, "
+            "lease_expires = NULL, updated_at = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (result, error, time.time(), job_id, worker_id),
+        ) == 1
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def results(self) -> List[Tuple[int, str, Optional[str]]]:
+        return self._conn.execute(
+            "SELECT id, status, result FROM jobs WHERE status IN ('done', 'failed') ORDER BY id"
+        ).fetchall()
@@ -0,0 +1,239 @@
+"""
+Deadline-aware scheduler in front of the validation pipeline.
+
+Each deed is submitted with a priority and an optional deadline (epoch seconds)
+and moves through three stages: screen (CPU), extract (LLM) and validate (CPU).
+Every stage has its own earliest-deadline-first queue, so a deed re-enters the
+ordering at each stage boundary and urgent work overtakes backfill between stages.
+
+A deed is urgent once its deadline is within SCHEDULER_URGENT_WINDOW_SECONDS.
+A deed submitted at SCHEDULER_URGENT_PRIORITY or above with no deadline is
+given one that far out. Backfill never takes the reserved LLM slots. It also
+waits whenever an urgent deed that has not reached extraction yet would miss
+its deadline, given recent LLM service times, unless an LLM slot is held
+for it. A running LLM call is never interrupted.
+
+    with DeedScheduler() as scheduler:
+        future = scheduler.submit(raw_text, deadline=time.time() + 600)
+        result = future.result()
+        print(scheduler.metrics())
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.config import (
+    SCHEDULER_CPU_WORKERS,
+    SCHEDULER_LLM_WORKERS,
+    SCHEDULER_RESERVED_LLM,
+    SCHEDULER_URGENT_PRIORITY,
+    SCHEDULER_URGENT_WINDOW_SECONDS,
+)
+from src.main import extract_document, failure_result, screen_document, validate_extracted
+from src.models import StageMetrics, ValidationResult
+
+# Stage -> worker pool that runs it
+STAGE_POOLS = {"screen": "cpu", "extract": "llm", "validate": "cpu"}
+NEXT_STAGE = {"screen": "extract", "extract": "validate", "validate": None}
+
+_SAMPLES_KEPT = 10_000
+_POLL_SECONDS = 0.05  # urgency changes with the clock, so idle workers re-check the queues
+
+
+class _Task:
+    __slots__ = ("seq", "raw_text", "priority", "deadline", "future", "stage",
+                 "extracted", "ready_at", "waited", "served")
+
+    def __init__(self, seq: int, raw_text: str, priority: int, deadline: Optional[float]):
+        self.seq = seq
+        self.raw_text = raw_text
+        self.priority = priority
+        self.deadline = deadline
+        self.future: Future = Future()
+        self.stage = "screen"
+        self.extracted = None
+        self.ready_at = time.monotonic()
+        self.waited = 0.0
+        self.served = 0.0
+
+    def key(self) -> Tuple[float, int, int]:
+        # Earliest deadline first, then higher priority, then submission order
+        return (math.inf if self.deadline is None else self.deadline, -self.priority, self.seq)
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[round(q * (len(ordered) - 1))]
+
+
+class DeedScheduler:
+    def __init__(
+        self,
+        llm_workers: int = SCHEDULER_LLM_WORKERS,
+        cpu_workers: int = SCHEDULER_CPU_WORKERS,
+        reserved_llm: int = SCHEDULER_RESERVED_LLM,
+        urgent_window: float = SCHEDULER_URGENT_WINDOW_SECONDS,
+        urgent_priority: int = SCHEDULER_URGENT_PRIORITY,
+    ):
+        if not 0 <= reserved_llm < llm_workers:
+            raise ValueError("reserved_llm must leave at least one LLM slot for backfill")
+        self.llm_workers = llm_workers
+        self.reserved_llm = reserved_llm
+        self.urgent_window = urgent_window
+        self.urgent_priority = urgent_priority
+
+        self._cond = threading.Condition()
+        self._queues: Dict[str, List[Tuple[Tuple[float, int, int], _Task]]] = {"llm": [], "cpu": []}
+        self._running = {"llm": 0, "cpu": 0}
+        # Deeds with a deadline that have not started extraction yet
+        self._before_llm: Dict[int, _Task] = {}
+        self._llm_estimate = 0.0  # moving average of extraction service time
+        self._seq = itertools.count()
+        self._closed = False
+        # Parcel duplicate check-then-add in validate_extracted must not interleave
+        self._validate_lock = threading.Lock()
+
+        self._waits: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=_SAMPLES_KEPT))
+        self._services: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=_SAMPLES_KEPT))
+        self.completed = 0
+        self.deadline_misses = 0
+
+        self._threads = [
+            threading.Thread(target=self._work, args=(pool,), daemon=True, name=f"deed-{pool}-{i}")
+            for pool, count in (("llm", llm_workers), ("cpu", cpu_workers))
+            for i in range(count)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self) -> "DeedScheduler":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+    def submit(self, raw_text: str, priority: int = 0, deadline: Optional[float] = None) -> "Future[ValidationResult]":
+        if deadline is None and priority >= self.urgent_priority:
+            deadline = time.time() + self.urgent_window
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("scheduler is shut down")
+            task = _Task(next(self._seq), raw_text, priority, deadline)
+            if deadline is not None:
+                self._before_llm[task.seq] = task
+            self._push(task)
+        return task.future
+
+    def shutdown(self, wait: bool = True) -> None:
+        # Queued deeds are still finished before the workers exit.
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def is_urgent(self, task: _Task, now: float) -> bool:
+        return task.deadline is not None and task.deadline - now <= self.urgent_window
+
+    def _push(self, task: _Task) -> None:
+        task.ready_at = time.monotonic()
+        heapq.heappush(self._queues[STAGE_POOLS[task.stage]], (task.key(), task))
+        self._cond.notify_all()
+
+    def _at_risk(self, now: float) -> int:
+        # Deeds that would miss their deadline if they first had to wait out a backfill LLM call
+        return sum(1 for task in self._before_llm.values() if task.deadline - now <= 2 * self._llm_estimate)
+
+    def _next(self, pool: str, now: float) -> Optional[_Task]:
+        queue = self._queues[pool]
+        if not queue:
+            return None
+        task = queue[0][1]
+        if pool == "llm" and not self.is_urgent(task, now):
+            # The head is the earliest deadline, so no urgent deed is waiting for an LLM slot
+            held_back = max(self.reserved_llm, self._at_risk(now))
+            if self._running["llm"] + 1 > self.llm_workers - held_back:
+                return None
+        heapq.heappop(queue)
+        return task
+
+    def _work(self, pool: str) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    task = self._next(pool, time.time())
+                    if task is not None:
+                        break
+                    if self._closed and not any(self._queues.values()) and not any(self._running.values()):
+                        return
+                    self._cond.wait(_POLL_SECONDS)
+                self._running[pool] += 1
+                if task.stage == "extract":
+                    self._before_llm.pop(task.seq, None)
+                label = f"{task.stage}/{'urgent' if self.is_urgent(task, time.time()) else 'backfill'}"
+
+            started = time.monotonic()
+            waited = started - task.ready_at
+            result = self._run(task)
+            served = time.monotonic() - started
+
+            with self._cond:
+                self._running[pool] -= 1
+                self._waits[label].append(waited)
+                self._services[label].append(served)
+                task.waited += waited
+                task.served += served
+                if task.stage == "extract":
+                    self._llm_estimate = served if not self._llm_estimate else 0.8 * self._llm_estimate + 0.2 * served
+                if result is None:
+                    task.stage = NEXT_STAGE[task.stage]
+                    self._push(task)
+                else:
+                    self._finish(task, result, label.split("/")[1])
+                self._cond.notify_all()
+
+    def _run(self, task: _Task) -> Optional[ValidationResult]:
+        # Run one stage; returns the final result, or None to move on to the next stage.
+        try:
+            if task.stage == "screen":
+                screen_document(task.raw_text, verbose=False)
+            elif task.stage == "extract":
+                task.extracted = extract_document(task.raw_text, verbose=False)
+            else:
+                with self._validate_lock:
+                    return validate_extracted(task.extracted, verbose=False)
+        except Exception as e:
+            return failure_result(e, verbose=False)
+        return None
+
+    def _finish(self, task: _Task, result: ValidationResult, urgency: str) -> None:
+        self._before_llm.pop(task.seq, None)  # screening may have failed it
+        self._waits[f"total/{urgency}"].append(task.waited)
+        self._services[f"total/{urgency}"].append(task.served)
+        self.completed += 1
+        if task.deadline is not None and time.time() > task.deadline:
+            self.deadline_misses += 1
+        task.future.set_result(result)
+
+    def metrics(self) -> Dict[str, StageMetrics]:
+        # Keyed "<stage>/<urgent|backfill>", plus "total/..." for whole deeds.
+        with self._cond:
+            return {
+                label: StageMetrics(
+                    count=len(self._services[label]),
+                    queue_wait_p50=_percentile(list(self._waits[label]), 0.5),
+                    queue_wait_p95=_percentile(list(self._waits[label]), 0.95),
+                    service_p50=_percentile(list(self._services[label]), 0.5),
+                    service_p95=_percentile(list(self._services[label]), 0.95),
+                )
+                for label in sorted(self._services)
+            }
@@ -0,0 +1,211 @@
+"""
+Queue workers: pull deeds from the SQLite job queue, run the pipeline stages,
+checkpoint each stage's output, and resume from the last checkpoint after a crash.
+
+    python -m src.jobs.worker enqueue deeds/            # one .txt file per deed
+    python -m src.jobs.worker enqueue --deadline 2026-10-19T17:00 urgent/
+    python -m src.jobs.worker work --processes 4        # on any host sharing the volume
+    python -m src.jobs.worker status
+    python -m src.jobs.worker results
+
+A deed's extraction is checkpointed as soon as it returns, so a job picked up
+again after a crash or lost lease does not pay for the LLM call twice.
+
+Workers share state through the extraction store: each process's dedup,
+parcel and template indexes catch up with records appended by every other
+worker before each lookup. A parcel recorded twice is therefore flagged
+whichever workers the two deeds land on.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from src.config import JOB_QUEUE_FILE
+from src.jobs.queue import JobQueue
+from src.llm.client import get_llm_client
+from src.main import extract_document, failure_result, screen_document, validate_extracted
+from src.models import ExtractedDeed, Job, ValidationResult
+from src.validate.errors import LLMServiceError, ValidationError
+
+
+class _Heartbeat(threading.Thread):
+    # Keeps the lease alive while a slow stage (the LLM call) runs; uses its own connection.
+
+    def __init__(self, queue: JobQueue, job_id: int, worker_id: str):
+        super().__init__(daemon=True)
+        self.path, self.lease_seconds = queue.path, queue.lease_seconds
+        self.job_id, self.worker_id = job_id, worker_id
+        self.stopped = threading.Event()
+        self.lost = False
+
+    def run(self) -> None:
+        queue = JobQueue(self.path, lease_seconds=self.lease_seconds)
+        try:
+            while not self.stopped.wait(max(self.lease_seconds / 3, 1.0)):
+                if not queue.heartbeat(self.job_id, self.worker_id):
+                    self.lost = True
+                    return
+        finally:
+            queue.close()
+
+
+class _LeaseLost(Exception):
+    pass
+
+
+def run_stages(queue: JobQueue, job: Job, worker_id: Optional[str] = None,
+               heartbeat: Optional[_Heartbeat] = None) -> ValidationResult:
+    # Each stage is skipped when its checkpoint already exists. Once the lease is lost to another
+    # worker, nothing more is spent or written: the new owner is running the same job.
+    def hold() -> None:
+        if heartbeat is not None and heartbeat.lost:
+            raise _LeaseLost()
+
+    def checkpoint(stage: str, output: str) -> None:
+        hold()
+        if not queue.checkpoint(job.id, stage, output, worker_id):
+            raise _LeaseLost()
+
+    saved = queue.get_checkpoint(job.id, "validate")
+    if saved is not None:
+        return ValidationResult.model_validate_json(saved)
+
+    if queue.get_checkpoint(job.id, "screen") is None:
+        try:
+            screen_document(job.raw_text, verbose=False)
+        except ValidationError as e:
+            return failure_result(e, verbose=False)
+        checkpoint("screen", "passed")
+
+    saved = queue.get_checkpoint(job.id, "extract")
+    if saved is not None:
+        extracted = ExtractedDeed.model_validate_json(saved)
+    else:
+        hold()
+        extracted = extract_document(job.raw_text, verbose=False)
+        checkpoint("extract", extracted.model_dump_json())
+
+    result = validate_extracted(extracted, verbose=False)
+    checkpoint("validate", result.model_dump_json())
+    return result
+
+
+def process_job(queue: JobQueue, job: Job, worker_id: str) -> bool:
+    # Returns False when the lease was lost and the outcome was left to the new owner.
+    heartbeat = _Heartbeat(queue, job.id, worker_id)
+    heartbeat.start()
+    try:
+        result = run_stages(queue, job, worker_id, heartbeat)
+    except _LeaseLost:
+        recorded = False
+    except LLMServiceError as e:
+        # Network, rate limit or API failure, or no usable client on this host: retry later
+        recorded = queue.nack(job.id, worker_id, str(e), failure_result(e, verbose=False).model_dump_json())
+    except ValidationError as e:
+        # A final verdict; retrying an unparseable, ill-typed or disputed read would only pay for it again
+        recorded = queue.ack(job.id, worker_id, failure_result(e, verbose=False).model_dump_json())
+    except Exception as e:
+        recorded = queue.fail(job.id, worker_id, f"{e.__class__.__name__}: {e}",
+                              failure_result(e, verbose=False).model_dump_json())
+    else:
+        recorded = queue.ack(job.id, worker_id, result.model_dump_json())
+    finally:
+        heartbeat.stopped.set()
+
+    if not recorded:
+        print(f"{worker_id}: lease on job {job.id} lost, outcome left to its new owner", file=sys.stderr)
+    return recorded
+
+
+def run_worker(
+    path: str = JOB_QUEUE_FILE,
+    worker_id: Optional[str] = None,
+    forever: bool = False,
+    idle_sleep: float = 1.0,
+) -> int:
+    # Process jobs until the queue is empty (or forever); returns the number of outcomes recorded.
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    try:
+        # A host that cannot reach the LLM leaves the queue to workers that can
+        get_llm_client()
+    except LLMServiceError as e:
+        print(f"{worker_id}: {e}; not leasing jobs", file=sys.stderr)
+        return 0
+    queue = JobQueue(path)
+    handled = 0
+    try:
+        while True:
+            job = queue.lease(worker_id)
+            if job is None:
+                if not forever:
+                    return handled
+                time.sleep(idle_sleep)
+                continue
+            handled += process_job(queue, job, worker_id)
+    finally:
+        queue.close()
+
+
+def _deed_files(paths: List[str]) -> List[Path]:
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob("*.txt")) if path.is_dir() else [path])
+    return files
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Durable deed validation queue.")
+    parser.add_argument("--queue", default=JOB_QUEUE_FILE, help="SQLite queue file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Queue deed OCR files (or directories of .txt files)")
+    enqueue.add_argument("paths", nargs="+")
+    enqueue.add_argument("--priority", type=int, default=0, help="Higher runs first among equal deadlines")
+    enqueue.add_argument("--deadline", type=datetime.fromisoformat, help="Recording deadline (ISO date/time)")
+
+    work = commands.add_parser("work", help="Run workers")
+    work.add_argument("--processes", type=int, default=1)
+    work.add_argument("--forever", action="store_true", help="Keep polling when the queue is empty")
+
+    commands.add_parser("status", help="Job counts by status")
+    commands.add_parser("results", help="Finished jobs as JSON lines")
+    args = parser.parse_args(argv)
+
+    if args.command == "enqueue":
+        queue = JobQueue(args.queue)
+        deadline = args.deadline.timestamp() if args.deadline else None
+        added = sum(
+            queue.enqueue(f.read_text(), priority=args.priority, deadline=deadline)[1]
+            for f in _deed_files(args.paths)
+        )
+        print(f"Queued {added} new deeds")
+    elif args.command == "work":
+        workers = [
+            multiprocessing.Process(target=run_worker, args=(args.queue,), kwargs={"forever": args.forever})
+            for _ in range(args.processes)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    elif args.command == "status":
+        for status, count in sorted(JobQueue(args.queue).counts().items()):
+            print(f"{status:8} {count}")
+    elif args.command == "results":
+        for job_id, status, result in JobQueue(args.queue).results():
+            print(json.dumps({"job": job_id, "status": status, "result": json.loads(result) if result else None}))
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# Model cascade: the cheap model extracts, deterministic checks flag suspect fields, and only those
+# are re-read by a stronger model. A suspect value stands only when two independent reads agree on it.
+
+from typing import Dict, Iterable, List, Tuple
+
+from pydantic import ValidationError as PydanticValidationError
+
+from src.config import MONEY_TOLERANCE, OPENAI_STRONG_MODEL, CASCADE_SAMPLE_TEMPERATURE
+from src.enrich.county_resolver import resolve_county
+from src.enrich.normalizer import OCR_VARIANT_CONFIDENCE
+from src.llm.client import get_llm_client
+from src.llm.prompts import create_field_prompt
+from src.models import CascadeReport, County, ExtractedDeed
+from src.utils.dates import parse_date
+from src.utils.money_words import parse_money_words
+from src.utils.similarity import values_agree
+from src.validate.errors import ExtractionError, LLMServiceError, ReadDisagreementError, ValidationError
+
+
+def find_suspect_fields(fields: dict, counties: List[County]) -> Dict[str, str]:
+    # Fields whose value makes a deterministic check fail or look shaky; works on partial extractions too.
+    suspects: Dict[str, str] = {}
+
+    parsed = {}
+    for name in ("date_signed", "date_recorded"):
+        if isinstance(fields.get(name), str):
+            try:
+                parsed[name] = parse_date(fields[name])
+            except ValueError:
+                suspects[name] = "date does not parse"
+    if len(parsed) == 2 and parsed["date_recorded"] < parsed["date_signed"]:
+        suspects["date_signed"] = suspects["date_recorded"] = "recorded before signed"
+
+    numeric, words = fields.get("amount_numeric"), fields.get("amount_words")
+    if isinstance(words, str):
+        try:
+            parsed_words = parse_money_words(words)
+        except ValueError:
+            suspects["amount_words"] = "amount in words does not parse"
+        else:
+            if isinstance(numeric, (int, float)) and abs(numeric - parsed_words) > MONEY_TOLERANCE:
+                suspects["amount_numeric"] = suspects["amount_words"] = "numeric and written amounts disagree"
+
+    if isinstance(fields.get("county_raw"), str):
+        try:
+            _, _, confidence = resolve_county(fields["county_raw"], counties)
+        except ValidationError:
+            suspects["county_raw"] = "no county match"
+        else:
+            # Exact spellings and OCR variants are trusted; a fuzzy match may be a misread
+            if confidence < OCR_VARIANT_CONFIDENCE:
+                suspects["county_raw"] = f"county matched with {confidence * 100:.0f}% confidence"
+
+    return suspects
+
+
+def _read(client, raw_text: str, fields: List[str], temperature: float) -> dict:
+    try:
+        data, _ = client.extract_json(create_field_prompt(raw_text, fields), temperature=temperature)
+    except LLMServiceError:
+        raise
+    except Exception as e:
+        raise ExtractionError(f"Failed to re-read fields {fields}: {e}")
+    return data if isinstance(data, dict) else {}
+
+
+def reread_fields(raw_text: str, fields: dict, suspects: Dict[str, str], client=None) -> Tuple[dict, CascadeReport]:
+    # Re-read suspect fields with the stronger model; a tie-break sample settles disagreements.
+    report = CascadeReport(suspects=dict(suspects))
+    client = client or get_llm_client(OPENAI_STRONG_MODEL)
+
+    strong = _read(client, raw_text, list(suspects), temperature=0.0)
+    report.escalated_calls += 1
+    disputed = []
+    for field in suspects:
+        if values_agree(strong.get(field), fields.get(field)):
+            report.confirmed.append(field)
+        else:
+            disputed.append(field)
+
+    updated = dict(fields)
+    if disputed:
+        sample = _read(client, raw_text, disputed, temperature=CASCADE_SAMPLE_TEMPERATURE)
+        report.escalated_calls += 1
+        unresolved = []
+        for field in disputed:
+            if values_agree(sample.get(field), strong.get(field)):
+                updated[field] = strong[field]
+                report.corrected.append(field)
+            elif values_agree(sample.get(field), fields.get(field)):
+                report.confirmed.append(field)
+            else:
+                unresolved.append(field)
+        if unresolved:
+            details = ", ".join(
+                f"{f}: {fields.get(f)!r} / {strong.get(f)!r} / {sample.get(f)!r}" for f in unresolved
+            )
+            raise ReadDisagreementError(f"No two reads agree ({details}); manual review required.")
+
+    return updated, report
+
+
+def run_cascade(
+    raw_text: str,
+    deed: ExtractedDeed,
+    counties: List[County],
+    client=None,
+    settled: Iterable[str] = (),
+) -> Tuple[ExtractedDeed, CascadeReport]:
+    # settled: fields the stronger model already read for this deed
+    settled = set(settled)
+    suspects = {
+        field: reason for field, reason in find_suspect_fields(deed.model_dump(), counties).items()
+        if field not in settled
+    }
+    if not suspects:
+        return deed, CascadeReport()
+
+    updated, report = reread_fields(raw_text, deed.model_dump(), suspects, client)
+    try:
+        return ExtractedDeed(**updated), report
+    except PydanticValidationError as e:
+        raise ExtractionError(f"Stronger model returned ill-typed fields: {e}")
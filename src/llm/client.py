@@ -1,16 +1,31 @@
 # OpenAI integration for LLM interactions
 
-from typing import Optional
+from typing import Dict, Iterator, Optional, Tuple
 import json
+import threading
 
 try:
+    import openai
     from openai import OpenAI
     OPENAI_AVAILABLE = True
+    # Timeouts (an APIConnectionError), dropped connections, 429 and 5xx
+    _TRANSIENT_ERRORS = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
 except ImportError:
     OPENAI_AVAILABLE = False
+    _TRANSIENT_ERRORS = ()
 
 from src.config import OPENAI_API_KEY, OPENAI_MODEL
-from src.validate.errors import ExtractionError
+from src.validate.errors import ExtractionError, LLMServiceError
+
+
+def _api_error(e: Exception, action: str) -> ExtractionError:
+    # Only transient failures are worth retrying; a rejected request (bad request, bad key,
+    # context too long) would fail the same way again.
+    status = getattr(e, "status_code", None)
+    transient = isinstance(e, _TRANSIENT_ERRORS + (TimeoutError, ConnectionError)) or (
+        isinstance(status, int) and (status == 429 or status >= 500)
+    )
+    return (LLMServiceError if transient else ExtractionError)(f"{action}: {e}")
 
 
 class LLMClient:
@@ -32,46 +47,89 @@ class LLMClient:
         self.model = model
         self.client = OpenAI(api_key=self.api_key)
 
-    def extract_json(self, prompt: str, temperature: float = 0.0) -> dict:
+    @staticmethod
+    def _messages(prompt: str) -> list:
+        return [
+            {
+                "role": "system",
+                "content": "You are a precise data extraction system. "
+                           "Extract structured data exactly as it appears. "
+                           "Do not validate, correct, or interpret values. "
+                           "Return only valid JSON."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+
+    @staticmethod
+    def _usage(usage) -> Dict[str, int]:
+        return {
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+            "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        }
+
+    def extract_json(self, prompt: str, temperature: float = 0.0) -> Tuple[dict, Dict[str, int]]:
+        # Returns (parsed JSON, token usage of this completion); the client is shared, so usage is not kept on it.
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
                 temperature=temperature,
                 response_format={"type": "json_object"},
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a precise data extraction system. "
-                                   "Extract structured data exactly as it appears. "
-                                   "Do not validate, correct, or interpret values. "
-                                   "Return only valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
+                messages=self._messages(prompt)
             )
+        except Exception as e:
+            raise _api_error(e, "LLM extraction failed")
+
+        try:
+            usage = self._usage(getattr(response, "usage", None))
 
             content = response.choices[0].message.content
             data = json.loads(content)
 
-            return data
+            return data, usage
 
         except json.JSONDecodeError as e:
             raise ExtractionError(f"LLM returned invalid JSON: {e}")
         except Exception as e:
             raise ExtractionError(f"LLM extraction failed: {e}")
 
+    def stream_json(self, prompt: str, temperature: float = 0.0) -> Iterator[str]:
+        # Yield completion text as it arrives; closing the generator cancels the request.
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                temperature=temperature,
+                response_format={"type": "json_object"},
+                messages=self._messages(prompt),
+                stream=True
+            )
+        except Exception as e:
+            raise _api_error(e, "LLM extraction failed")
+
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise _api_error(e, "LLM streaming failed")
+        finally:
+            stream.close()
 
-# Singleton instance
-_client_instance: Optional[LLMClient] = None
 
+# One instance per model
+_client_instances: Dict[str, LLMClient] = {}
+_instance_lock = threading.Lock()
 
-def get_llm_client() -> LLMClient:
-    global _client_instance
 
-    if _client_instance is None:
-        _client_instance = LLMClient()
+def get_llm_client(model: str = OPENAI_MODEL) -> LLMClient:
+    # A missing package or key is the host's fault, not the deed's: it surfaces as a service error
+    with _instance_lock:
+        if model not in _client_instances:
+            try:
+                _client_instances[model] = LLMClient(model=model)
+            except (ImportError, ValueError) as e:
+                raise LLMServiceError(f"LLM client unavailable: {e}")
 
-    return _client_instance
+    return _client_instances[model]
@@ -1,28 +1,137 @@
 # LLM-based deed field extraction
-from src.models import ExtractedDeed
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from pydantic import ValidationError as PydanticValidationError
+
+from src.models import ExtractedDeed, RepairStats
 from src.llm.client import get_llm_client
-from src.llm.prompts import create_extraction_prompt
-from src.validate.errors import ExtractionError, MissingFieldError
+from src.llm.prompts import FIELD_SCHEMA, create_extraction_prompt, create_repair_prompt
+from src.llm.streaming import IncrementalJSONParser
+from src.validate.errors import ExtractionError, LLMServiceError, MissingFieldError
 
-def extract_deed_fields(raw_text: str) -> ExtractedDeed:
-    prompt = create_extraction_prompt(raw_text)
+REQUIRED_FIELDS = list(FIELD_SCHEMA)
+
+_repair_stats = RepairStats()
+# Extractions run on several threads under the scheduler
+_stats_lock = threading.Lock()
+
+
+def get_repair_stats() -> RepairStats:
+    return _repair_stats
+
+
+def reset_repair_stats() -> None:
+    global _repair_stats
+    _repair_stats = RepairStats()
+
+
+def find_invalid_fields(data: dict) -> Dict[str, str]:
+    # Map each missing or ill-typed field to the reason it was rejected.
     try:
-        client = get_llm_client()
-        data = client.extract_json(prompt)
+        ExtractedDeed(**data)
+        return {}
+    except PydanticValidationError as e:
+        problems = {}
+        for err in e.errors():
+            if err["loc"]:
+                field = str(err["loc"][0])
+                problems.setdefault(field, "missing" if err["type"] == "missing" else err["msg"])
+        return problems
+
+
+def repair_fields(raw_text: str, data: dict, problems: Dict[str, str], client) -> dict:
+    # Ask only for the broken fields; fields that already validated are never overwritten.
+    stats = _repair_stats
+    with _stats_lock:
+        stats.attempts += 1
+        stats.fields_requested += len(problems)
+
+    try:
+        patch, usage = client.extract_json(create_repair_prompt(raw_text, problems))
+    except LLMServiceError:
+        raise
     except Exception as e:
-        raise ExtractionError(f"Failed to extract deed fields: {e}")
+        raise ExtractionError(f"Failed to repair fields {list(problems)}: {e}")
+    with _stats_lock:
+        stats.extra_prompt_tokens += usage.get("prompt_tokens", 0)
+        stats.extra_completion_tokens += usage.get("completion_tokens", 0)
+
+    repaired = dict(data)
+    for field in problems:
+        if field in patch:
+            repaired[field] = patch[field]
+
+    remaining = find_invalid_fields(repaired)
+    with _stats_lock:
+        stats.fields_recovered += len(set(problems) - set(remaining))
+        if not remaining:
+            stats.recovered += 1
+    return repaired
+
+
+def build_deed(raw_text: str, data: dict, client=None, repair: bool = True) -> ExtractedDeed:
+    # Turn raw LLM output into an ExtractedDeed, repairing bad fields with a targeted prompt.
+    if not isinstance(data, dict):
+        raise ExtractionError(f"LLM returned {type(data).__name__}, expected a JSON object")
 
-    required_fields = [
-        "doc", "county_raw", "state", "date_signed", "date_recorded",
-        "grantor", "grantee", "amount_numeric", "amount_words", "apn", "status"
-    ]
+    problems = find_invalid_fields(data)
+    if problems and repair:
+        data = repair_fields(raw_text, data, problems, client or get_llm_client())
+        problems = find_invalid_fields(data)
 
-    missing = [field for field in required_fields if field not in data]
+    missing = [field for field in REQUIRED_FIELDS if problems.get(field) == "missing"]
     if missing:
         raise MissingFieldError(f"Missing required fields: {missing}")
-        
+
     try:
         deed = ExtractedDeed(**data)
         return deed
     except Exception as e:
         raise ExtractionError(f"Failed to parse extracted data: {e}")
+
+
+def extract_deed_fields(raw_text: str, repair: bool = True) -> ExtractedDeed:
+    prompt = create_extraction_prompt(raw_text)
+    try:
+        client = get_llm_client()
+        data, _ = client.extract_json(prompt)
+    except LLMServiceError:
+        raise
+    except Exception as e:
+        raise ExtractionError(f"Failed to extract deed fields: {e}")
+
+    return build_deed(raw_text, data, client=client, repair=repair)
+
+
+def extract_deed_fields_streaming(
+    raw_text: str,
+    on_field: Optional[Callable[[str, Any], None]] = None,
+    repair: bool = True,
+) -> ExtractedDeed:
+    # Stream the completion and hand each field to on_field as soon as it is complete.
+    # An exception raised by on_field cancels the request and propagates to the caller.
+    prompt = create_extraction_prompt(raw_text)
+    parser = IncrementalJSONParser()
+    try:
+        client = get_llm_client()
+        stream = client.stream_json(prompt)
+    except LLMServiceError:
+        raise
+    except Exception as e:
+        raise ExtractionError(f"Failed to extract deed fields: {e}")
+
+    try:
+        for chunk in stream:
+            try:
+                completed = parser.feed(chunk)
+            except ValueError as e:
+                raise ExtractionError(f"LLM returned invalid JSON: {e}")
+            for field, value in completed:
+                if on_field is not None:
+                    on_field(field, value)
+    finally:
+        stream.close()
+
+    # A truncated stream still keeps its completed fields; the repair pass asks for the rest
+    return build_deed(raw_text, parser.data, client=client, repair=repair)
@@ -1,4 +1,27 @@
 # LLM prompts for deed extraction.
+from typing import Dict
+
+# Field name -> schema description shown to the model
+FIELD_SCHEMA: Dict[str, str] = {
+    "doc": "document number (string)",
+    "county_raw": "county name exactly as shown (string)",
+    "state": "state code (string)",
+    "date_signed": "signing date in YYYY-MM-DD format (string)",
+    "date_recorded": "recording date in YYYY-MM-DD format (string)",
+    "grantor": "grantor name (string)",
+    "grantee": "grantee name (string)",
+    "amount_numeric": "transaction amount as number (float)",
+    "amount_words": "transaction amount in words exactly as written (string)",
+    "apn": "assessor parcel number (string)",
+    "status": "document status (string)",
+}
+
+
+def _schema_block(fields) -> str:
+    lines = [f'  "{field}": "{FIELD_SCHEMA[field]}"' for field in fields]
+    return "{\n" + ",\n".join(lines) + "\n}"
+
+
 def create_extraction_prompt(raw_text: str) -> str:
     return f"""Extract structured data from this deed OCR text.
 
@@ -10,22 +33,44 @@ IMPORTANT INSTRUCTIONS:
 - Return ONLY valid JSON matching the schema below
 
 SCHEMA:
-{{
-  "doc": "document number (string)",
-  "county_raw": "county name exactly as shown (string)",
-  "state": "state code (string)",
-  "date_signed": "signing date in YYYY-MM-DD format (string)",
-  "date_recorded": "recording date in YYYY-MM-DD format (string)",
-  "grantor": "grantor name (string)",
-  "grantee": "grantee name (string)",
-  "amount_numeric": "transaction amount as number (float)",
-  "amount_words": "transaction amount in words exactly as written (string)",
-  "apn": "assessor parcel number (string)",
-  "status": "document status (string)"
-}}
+{_schema_block(FIELD_SCHEMA)}
 
 OCR TEXT:
 {raw_text}
 
 Return ONLY the JSON object with extracted data. No other text.
 """
+
+
+def create_repair_prompt(raw_text: str, problems: Dict[str, str]) -> str:
+    # Targeted prompt asking only for the fields that were missing or ill-typed.
+    issues = "\n".join(f"- {field}: {reason}" for field, reason in problems.items())
+    return f"""Extract ONLY these fields from the deed OCR text, exactly as they appear.
+Do NOT validate or correct values.
+
+PREVIOUS PROBLEMS:
+{issues}
+
+SCHEMA:
+{_schema_block(problems)}
+
+OCR TEXT:
+{raw_text}
+
+Return ONLY a JSON object with these keys.
+"""
+
+
+def create_field_prompt(raw_text: str, fields) -> str:
+    # Independent re-read of a few fields; deliberately says nothing about why they are asked for.
+    return f"""Extract ONLY these fields from the deed OCR text, exactly as they appear.
+Do NOT validate, correct, or fix values. If a value looks wrong, extract it anyway.
+
+SCHEMA:
+{_schema_block(fields)}
+
+OCR TEXT:
+{raw_text}
+
+Return ONLY a JSON object with these keys.
+"""
@@ -0,0 +1,101 @@
+# Incremental parser for the streamed JSON object, emitting each top-level field as soon as its value is complete.
+
+import json
+from typing import Any, Dict, List, Tuple
+
+_WHITESPACE = " \t\r\n"
+
+
+class IncrementalJSONParser:
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+        self._state = "start"
+        self._token: List[str] = []
+        self._key = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def complete(self) -> bool:
+        return self._state == "done"
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        # Consume more completion text; returns the (field, value) pairs completed by it.
+        completed = []
+        for ch in chunk:
+            field = self._step(ch)
+            if field is not None:
+                completed.append(field)
+        return completed
+
+    def _emit(self) -> Tuple[str, Any]:
+        value = json.loads(''.join(self._token))
+        self.data[self._key] = value
+        self._token = []
+        return self._key, value
+
+    def _step(self, ch: str):
+        state = self._state
+
+        if state in ("string", "key", "container"):
+            self._token.append(ch)
+            if self._escape:
+                self._escape = False
+            elif ch == "\\" and (state != "container" or self._in_string):
+                self._escape = True
+            elif ch == '"':
+                if state == "key":
+                    self._key = json.loads(''.join(self._token))
+                    self._token = []
+                    self._state = "colon"
+                elif state == "string":
+                    self._state = "comma_or_end"
+                    return self._emit()
+                else:
+                    self._in_string = not self._in_string
+            elif state == "container" and not self._in_string and ch in "{[":
+                self._depth += 1
+            elif state == "container" and not self._in_string and ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._state = "comma_or_end"
+                    return self._emit()
+            return None
+
+        if state == "scalar":
+            if ch not in ",}" and ch not in _WHITESPACE:
+                self._token.append(ch)
+                return None
+            field = self._emit()
+            self._state = {",": "key_or_end", "}": "done"}.get(ch, "comma_or_end")
+            return field
+
+        if ch in _WHITESPACE:
+            return None
+
+        if state == "start" and ch == "{":
+            self._state = "key_or_end"
+        elif state == "key_or_end" and ch == '"':
+            self._token = [ch]
+            self._state = "key"
+        elif state == "key_or_end" and ch == "}":
+            self._state = "done"
+        elif state == "colon" and ch == ":":
+            self._state = "value"
+        elif state == "value":
+            self._token = [ch]
+            if ch == '"':
+                self._state = "string"
+            elif ch in "{[":
+                self._depth, self._in_string = 1, False
+                self._state = "container"
+            else:
+                self._state = "scalar"
+        elif state == "comma_or_end" and ch == ",":
+            self._state = "key_or_end"
+        elif state == "comma_or_end" and ch == "}":
+            self._state = "done"
+        else:
+            raise ValueError(f"Unexpected character {ch!r} in streamed JSON ({state})")
+        return None
@@ -1,6 +1,7 @@
 """
 This is the complete validation pipeline:
 
+    0. Screen the raw OCR text for conclusive date/amount errors
     1. Extract structured data from OCR using LLM
     2. Enrich with county resolution and tax rate
     3. Validate with deterministic business rules
@@ -10,12 +11,21 @@ This is the complete validation pipeline:
 
 import json
 import sys
+from typing import List, Optional, Tuple
 
-from src.models import ValidationResult, ValidationError as ValidationErrorModel
-from src.llm.extractor import extract_deed_fields
-from src.enrich.county_resolver import load_counties, enrich_with_county
-from src.validate.rules import validate_deed
+from src.models import CascadeReport, County, ExtractedDeed, ValidationResult, ValidationError as ValidationErrorModel
+from src.llm.extractor import build_deed, extract_deed_fields, extract_deed_fields_streaming, get_repair_stats
+from src.enrich.county_resolver import get_reference_data, enrich_with_county
+from src.enrich.rate_store import TaxRateStore
+from src.validate.rules import raise_collected, validate_deed
+from src.validate.partial import PartialDeedChecker
+from src.validate.screening import screen_raw_text
 from src.validate.errors import ValidationError
+from src.store.extractions import get_extraction_store
+from src.dedup.index import get_dedup_indexes
+from src.templates.induction import get_template_store
+from src.llm.cascade import find_suspect_fields, reread_fields, run_cascade
+from src.config import OPENAI_MODEL, OPENAI_STRONG_MODEL, STREAM_EXTRACTION, CASCADE_ENABLED
 
 
 RAW_OCR_TEXT = """*** RECORDING REQ ***
@@ -30,36 +40,132 @@ APN: 992-001-XA
 Status: PRELIMINARY
 *** END ***"""
 
-def validate_deed_document(raw_text: str) -> ValidationResult:
-    errors = []
+def _log(verbose: bool, message: str = "") -> None:
+    if verbose:
+        print(message)
+
+
+def _cancel_on_failure(checker: PartialDeedChecker, verbose: bool = True):
+    # Streaming callback: run checks on each completed field, cancel once a failure is certain.
+    def on_field(field: str, value) -> None:
+        if checker.add(field, value):
+            _log(verbose, f"  X Failure certain after '{field}', cancelling extraction")
+            raise_collected(checker.errors)
+    return on_field
+
+
+def _extract_with_llm(
+    raw_text: str, verbose: bool, stream: bool, cascade: bool, checker: Optional[PartialDeedChecker] = None
+) -> Tuple[ExtractedDeed, Optional[CascadeReport]]:
+    # The report is set when a cancelled streaming read was already re-read by the stronger model.
+    _log(verbose, "Step 1: Extracting fields with LLM...")
+    if not stream:
+        return extract_deed_fields(raw_text), None
+
+    checker = checker or PartialDeedChecker(get_reference_data()[0])
     try:
-        print("Step 1: Extracting fields with LLM...")
-        extracted = extract_deed_fields(raw_text)
-        print(f"  > Extracted: {extracted.doc}")
-        print(f"    County (raw): {extracted.county_raw}")
-        print(f"    Date Signed: {extracted.date_signed}")
-        print(f"    Date Recorded: {extracted.date_recorded}")
-        print(f"    Amount (numeric): ${extracted.amount_numeric:,.2f}")
-        print(f"    Amount (words): {extracted.amount_words}")
-        print()
+        return extract_deed_fields_streaming(raw_text, on_field=_cancel_on_failure(checker, verbose)), None
+    except ValidationError:
+        if not (cascade and checker.failed):
+            raise
+        # The cancelled read is the only evidence so far: a stronger read must agree before it stands
+        suspects = find_suspect_fields(checker.fields, checker.counties)
+        if not suspects:
+            raise
+        updated, report = reread_fields(raw_text, checker.fields, suspects)
+        if not report.corrected:
+            raise
+        # Keep the corrected read; the repair prompt asks only for the fields the stream never sent
+        _log(verbose, f"  > Stronger model disagrees on {report.corrected}, completing the read")
+        return build_deed(raw_text, updated), report
 
-        print("Step 2: Enriching with county data...")
-        counties = load_counties()
-        enriched = enrich_with_county(extracted, counties)
-        print(f"  > County Resolved: '{extracted.county_raw}' -> '{enriched.county_canonical}'")
-        print(f"    Tax Rate: {enriched.tax_rate * 100:.1f}%")
-        print(f"    Match Confidence: {enriched.match_confidence * 100:.1f}%")
-        print()
 
-        print("Step 3: Validating business rules...")
+def extract_document(
+    raw_text: str,
+    verbose: bool = True,
+    persist: bool = True,
+    stream: bool = STREAM_EXTRACTION,
+    cascade: bool = CASCADE_ENABLED,
+    checker: Optional[PartialDeedChecker] = None,
+) -> ExtractedDeed:
+    # Stage 1: extraction, persisted to the extraction store for later replay.
+    # A streamed extraction runs its checks in checker, whose county resolution enrichment can reuse.
+    # Rescans and resubmissions of an already extracted deed reuse the earlier extraction,
+    # and deeds in a learned recorder layout are extracted locally instead of by the LLM.
+    dedup, _ = get_dedup_indexes()
+    duplicate = dedup.find(raw_text)
+    if duplicate is not None and duplicate.reusable:
+        extracted = duplicate.record.deed
+        _log(verbose, f"Step 1: Reusing extraction of {extracted.doc} "
+                      f"({duplicate.kind} duplicate, similarity {duplicate.similarity * 100:.1f}%)")
+    else:
+        if duplicate is not None:
+            _log(verbose, f"Step 1: Near duplicate of {duplicate.record.deed.doc} with changed content "
+                          f"(similarity {duplicate.similarity * 100:.1f}%), extracting it anew")
+        templates = get_template_store()
+        local = templates.extract(raw_text)
+        if local is not None:
+            extracted, template = local
+            early = None
+            model, source = f"template:{template.fingerprint}", "template"
+            _log(verbose, f"Step 1: Extracting fields with layout template {template.fingerprint}...")
+        else:
+            extracted, early = _extract_with_llm(raw_text, verbose, stream, cascade, checker)
+            model, source = OPENAI_MODEL, "llm"
+
+        if cascade:
+            # Only fields the deterministic checks flag are re-read by the stronger model,
+            # and never twice for one deed
+            settled = list(early.suspects) if early is not None else []
+            extracted, report = run_cascade(raw_text, extracted, get_reference_data()[0], settled=settled)
+            if report.suspects:
+                _log(verbose, f"  > Suspect fields re-read with {OPENAI_STRONG_MODEL}: {list(report.suspects)}")
+                _log(verbose, f"    Confirmed: {report.confirmed}  Corrected: {report.corrected}")
+            if report.corrected or early is not None:
+                model = f"{model}+{OPENAI_STRONG_MODEL}"
+
+        if persist:
+            # The dedup, parcel and template indexes of every process pick the record up from the store
+            get_extraction_store().append(raw_text, extracted, model=model, source=source)
+    _log(verbose, f"  > Extracted: {extracted.doc}")
+    _log(verbose, f"    County (raw): {extracted.county_raw}")
+    _log(verbose, f"    Date Signed: {extracted.date_signed}")
+    _log(verbose, f"    Date Recorded: {extracted.date_recorded}")
+    _log(verbose, f"    Amount (numeric): ${extracted.amount_numeric:,.2f}")
+    _log(verbose, f"    Amount (words): {extracted.amount_words}")
+    _log(verbose)
+    return extracted
+
+
+def enrich_and_validate(
+    extracted: ExtractedDeed,
+    counties: Optional[List[County]] = None,
+    verbose: bool = True,
+    rate_store: Optional[TaxRateStore] = None,
+    resolved_county: Optional[Tuple[str, float, float]] = None,
+) -> ValidationResult:
+    # Stages 2-3: deterministic enrichment and validation, no LLM involved.
+    try:
+        _log(verbose, "Step 2: Enriching with county data...")
+        if counties is None:
+            counties, rate_store = get_reference_data()
+        elif rate_store is None:
+            rate_store = TaxRateStore.from_counties(counties)
+        enriched = enrich_with_county(extracted, counties, rate_store, resolved=resolved_county)
+        _log(verbose, f"  > County Resolved: '{extracted.county_raw}' -> '{enriched.county_canonical}'")
+        _log(verbose, f"    Tax Rate: {enriched.tax_rate * 100:.1f}%")
+        _log(verbose, f"    Match Confidence: {enriched.match_confidence * 100:.1f}%")
+        _log(verbose)
+
+        _log(verbose, "Step 3: Validating business rules...")
         validate_deed(
             date_signed=enriched.date_signed,
             date_recorded=enriched.date_recorded,
             amount_numeric=enriched.amount_numeric,
             amount_words=enriched.amount_words
         )
-        print("  > All validations passed!")
-        print()
+        _log(verbose, "  > All validations passed!")
+        _log(verbose)
         closing_cost = enriched.amount_numeric * enriched.tax_rate
 
         return ValidationResult(
@@ -68,56 +174,105 @@ def validate_deed_document(raw_text: str) -> ValidationResult:
             closing_cost=closing_cost,
             errors=[]
         )
+    except Exception as e:
+        return failure_result(e, verbose)
 
-    except ValidationError as e:
+
+def failure_result(e: Exception, verbose: bool = True) -> ValidationResult:
+    # Convert a raised error (possibly carrying several validation errors) into a failed result.
+    errors = []
+    if isinstance(e, ValidationError) and hasattr(e, 'validation_errors'):
         # multiple validation errors
-        if hasattr(e, 'validation_errors'):
-            print(f"  X Validation Failed: Multiple errors detected")
-            print()
-
-            for idx, err in enumerate(e.validation_errors, 1):
-                print(f"  Error {idx}: {err.__class__.__name__}")
-                print(f"    {str(err)}")
-                print()
-
-                errors.append(ValidationErrorModel(
-                    error_type=err.__class__.__name__,
-                    message=str(err)
-                ))
-        else:
-            # Single error
-            error_type = e.__class__.__name__
-            print(f"  X Validation Failed: {error_type}")
-            print(f"    {str(e)}")
-            print()
+        _log(verbose, "  X Validation Failed: Multiple errors detected")
+        _log(verbose)
+
+        for idx, err in enumerate(e.validation_errors, 1):
+            _log(verbose, f"  Error {idx}: {err.__class__.__name__}")
+            _log(verbose, f"    {str(err)}")
+            _log(verbose)
 
             errors.append(ValidationErrorModel(
-                error_type=error_type,
-                message=str(e)
+                error_type=err.__class__.__name__,
+                message=str(err)
             ))
-
-        return ValidationResult(
-            passed=False,
-            deed=None,
-            closing_cost=None,
-            errors=errors
-        )
-
-    except Exception as e:
-        print(f"  X Unexpected Error: {e}")
-        print()
+    else:
+        error_type = e.__class__.__name__
+        if isinstance(e, ValidationError):
+            # Single error
+            _log(verbose, f"  X Validation Failed: {error_type}")
+            _log(verbose, f"    {str(e)}")
+        else:
+            _log(verbose, f"  X Unexpected Error: {e}")
+        _log(verbose)
 
         errors.append(ValidationErrorModel(
-            error_type=e.__class__.__name__,
+            error_type=error_type,
             message=str(e)
         ))
 
-        return ValidationResult(
-            passed=False,
-            deed=None,
-            closing_cost=None,
-            errors=errors
-        )
+    return ValidationResult(
+        passed=False,
+        deed=None,
+        closing_cost=None,
+        errors=errors
+    )
+
+
+def add_error(result: ValidationResult, error: ValidationError, verbose: bool = True) -> ValidationResult:
+    # Fail a result with one more error found outside validate_deed.
+    _log(verbose, f"  X {error.__class__.__name__}")
+    _log(verbose, f"    {str(error)}")
+    _log(verbose)
+    return ValidationResult(
+        passed=False,
+        deed=None,
+        closing_cost=None,
+        errors=result.errors + [ValidationErrorModel(
+            error_type=error.__class__.__name__,
+            message=str(error)
+        )]
+    )
+
+
+def screen_document(raw_text: str, verbose: bool = True) -> None:
+    # Stage 0: deterministic checks on the raw OCR text, before any LLM spend.
+    _log(verbose, "Step 0: Screening raw text...")
+    screen_raw_text(raw_text)
+    _log(verbose, "  > No conclusive errors, continuing to extraction")
+    _log(verbose)
+
+
+def validate_deed_document(
+    raw_text: str,
+    verbose: bool = True,
+    stream: bool = STREAM_EXTRACTION,
+    cascade: bool = CASCADE_ENABLED,
+) -> ValidationResult:
+    checker = PartialDeedChecker(get_reference_data()[0]) if stream else None
+    try:
+        screen_document(raw_text, verbose=verbose)
+        extracted = extract_document(raw_text, verbose=verbose, stream=stream, cascade=cascade, checker=checker)
+    except Exception as e:
+        return failure_result(e, verbose)
+
+    resolved_county = checker.county_for(extracted.county_raw) if checker is not None else None
+    return validate_extracted(extracted, verbose=verbose, resolved_county=resolved_county)
+
+
+def validate_extracted(
+    extracted: ExtractedDeed,
+    verbose: bool = True,
+    resolved_county: Optional[Tuple[str, float, float]] = None,
+) -> ValidationResult:
+    # Everything after extraction: duplicate-parcel check, enrichment and business rules.
+    _, parcels = get_dedup_indexes()
+    duplicate_recording = parcels.check(extracted)
+    parcels.add(extracted)
+
+    result = enrich_and_validate(extracted, verbose=verbose, resolved_county=resolved_county)
+    if duplicate_recording is not None:
+        result = add_error(result, duplicate_recording, verbose)
+    return result
 
 
 def main():
@@ -127,6 +282,14 @@ def main():
     print()
     result = validate_deed_document(RAW_OCR_TEXT)
 
+    repair_stats = get_repair_stats()
+    if repair_stats.attempts:
+        print(
+            f"Field repair: {repair_stats.recovered}/{repair_stats.attempts} recovered "
+            f"({repair_stats.recovery_rate * 100:.1f}%), "
+            f"{repair_stats.extra_tokens} extra tokens"
+        )
+
     print("\nValidation Result")
     print("-" * 60)
     print()
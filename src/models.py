@@ -1,5 +1,5 @@
 # Data models for validation pipeline.
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel, Field
 
 class ExtractedDeed(BaseModel):
@@ -37,6 +37,103 @@ class ValidationResult(BaseModel):
     closing_cost: Optional[float] = Field(default=None, description="Calculated closing cost if passed")
 
 
+class CountyRate(BaseModel):
+    effective_from: str = Field(description="First day the rate applies (YYYY-MM-DD)")
+    tax_rate: float = Field(description="County tax rate")
+
+
 class County(BaseModel):
     name: str = Field(description="Official county name")
     tax_rate: float = Field(description="County tax rate")
+    state: Optional[str] = Field(default=None, description="State code (e.g., CA)")
+    rates: List[CountyRate] = Field(default_factory=list, description="Effective-dated rate history; empty means tax_rate always applied")
+
+
+class RepairStats(BaseModel):
+    # Running totals for the field-level repair pass
+    attempts: int = Field(default=0, description="Extractions that needed a repair prompt")
+    recovered: int = Field(default=0, description="Extractions fully recovered by the repair prompt")
+    fields_requested: int = Field(default=0, description="Fields asked for in repair prompts")
+    fields_recovered: int = Field(default=0, description="Fields that came back valid")
+    extra_prompt_tokens: int = Field(default=0, description="Prompt tokens spent on repair prompts")
+    extra_completion_tokens: int = Field(default=0, description="Completion tokens spent on repair prompts")
+
+    @property
+    def recovery_rate(self) -> float:
+        return self.recovered / self.attempts if self.attempts else 0.0
+
+    @property
+    def extra_tokens(self) -> int:
+        return self.extra_prompt_tokens + self.extra_completion_tokens
+
+
+class Provenance(BaseModel):
+    # Where a stored extraction came from
+    text_sha256: str = Field(description="SHA-256 of the raw OCR text")
+    raw_text: str = Field(description="Raw OCR text the extraction was made from")
+    model: str = Field(description="Model that produced the extraction")
+    extracted_at: str = Field(description="UTC timestamp of the extraction (ISO 8601)")
+    source: str = Field(default="llm", description="How the fields were extracted")
+    minhash: Optional[List[int]] = Field(default=None, description="MinHash signature of the raw OCR text")
+
+
+class ExtractionRecord(BaseModel):
+    # One line of the append-only extraction store
+    deed: ExtractedDeed = Field(description="Extracted deed fields")
+    provenance: Provenance = Field(description="Provenance of the extraction")
+
+
+class DedupMatch(BaseModel):
+    # An earlier extraction whose OCR text matches an incoming document
+    record: ExtractionRecord = Field(description="Stored extraction that matches")
+    kind: str = Field(description="'exact', 'rescan' (whitespace/OCR-confused characters only) or 'near'")
+    similarity: float = Field(description="Estimated Jaccard similarity of the OCR shingles")
+
+    @property
+    def reusable(self) -> bool:
+        # A near match may have edited content (amount, party, county): it is only a signal
+        return self.kind in ("exact", "rescan")
+
+
+class FieldRule(BaseModel):
+    # Where a field sits in a learned layout
+    label: str = Field(description="Normalized label anchoring the value (e.g., 'date signed')")
+    kind: str = Field(description="Value span: 'text', 'date', 'money' or 'paren'")
+
+
+class LayoutTemplate(BaseModel):
+    # Extraction template induced from LLM extractions of one recorder layout
+    fingerprint: str = Field(description="Hash of the layout's label sequence")
+    rules: Dict[str, FieldRule] = Field(default_factory=dict, description="Field name -> rule")
+    observations: int = Field(default=0, description="LLM extractions compared against the template")
+    agreements: int = Field(default=0, description="Observations the template reproduced exactly")
+    local_extractions: int = Field(default=0, description="Deeds extracted locally with this template")
+
+    @property
+    def agreement_rate(self) -> float:
+        return self.agreements / self.observations if self.observations else 0.0
+
+
+class CascadeReport(BaseModel):
+    # What the model cascade did for one deed
+    suspects: Dict[str, str] = Field(default_factory=dict, description="Suspect field -> reason it was flagged")
+    confirmed: List[str] = Field(default_factory=list, description="Suspect fields the stronger read agreed with")
+    corrected: List[str] = Field(default_factory=list, description="Fields replaced by two agreeing stronger reads")
+    escalated_calls: int = Field(default=0, description="Extra LLM calls made")
+
+
+class Job(BaseModel):
+    # A leased unit of work from the job queue
+    id: int = Field(description="Job id")
+    doc_key: str = Field(description="SHA-256 of the raw OCR text")
+    raw_text: str = Field(description="Raw OCR text to validate")
+    attempts: int = Field(description="Times the job has been leased, including this one")
+
+
+class StageMetrics(BaseModel):
+    # Queue-wait versus service time for one scheduler stage and deed class
+    count: int = Field(default=0, description="Stage executions measured")
+    queue_wait_p50: float = Field(default=0.0, description="Median seconds waiting for a slot")
+    queue_wait_p95: float = Field(default=0.0, description="95th percentile seconds waiting for a slot")
+    service_p50: float = Field(default=0.0, description="Median seconds running the stage")
+    service_p95: float = Field(default=0.0, description="95th percentile seconds running the stage")
@@ -0,0 +1,117 @@
+"""
+Replay enrichment and validation over stored extractions, with no LLM calls.
+
+    python -m src.replay --all
+    python -m src.replay --county "Santa Clara"
+    python -m src.replay --changed-since old_counties.json
+
+Only deeds affected by the change are re-validated: deeds in the named
+counties, deeds whose county's tax rate differs from an older counties file,
+or specific document numbers.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from src.models import County, ExtractionRecord, ValidationResult
+from src.enrich.county_resolver import load_counties, resolve_county
+from src.enrich.rate_store import TaxRateStore
+from src.store.extractions import ExtractionStore
+from src.config import EXTRACTION_STORE_FILE
+from src.main import enrich_and_validate
+from src.validate.errors import ValidationError
+
+
+def changed_counties(old: List[County], new: List[County]) -> Set[str]:
+    # County names that were added, removed, or had their tax rate or rate history changed.
+    old_rates = {c.name: (c.state, c.tax_rate, c.rates) for c in old}
+    new_rates = {c.name: (c.state, c.tax_rate, c.rates) for c in new}
+    return {
+        name for name in old_rates.keys() | new_rates.keys()
+        if old_rates.get(name) != new_rates.get(name)
+    }
+
+
+def select_records(
+    records: Iterable[ExtractionRecord],
+    counties: List[County],
+    county_names: Optional[Set[str]] = None,
+    docs: Optional[Set[str]] = None,
+) -> List[ExtractionRecord]:
+    # Pick the stored deeds affected by a change; no filters selects everything.
+    if county_names is None and docs is None:
+        return list(records)
+
+    wanted_counties = {name.lower() for name in county_names or ()}
+    selected = []
+    for record in records:
+        if docs and record.deed.doc in docs:
+            selected.append(record)
+            continue
+        if not wanted_counties:
+            continue
+        try:
+            canonical, _, _ = resolve_county(record.deed.county_raw, counties)
+        except ValidationError:
+            continue
+        if canonical.lower() in wanted_counties:
+            selected.append(record)
+    return selected
+
+
+def replay(
+    store: ExtractionStore,
+    counties: List[County],
+    county_names: Optional[Set[str]] = None,
+    docs: Optional[Set[str]] = None,
+) -> Dict[str, ValidationResult]:
+    records = select_records(store.latest_by_doc().values(), counties, county_names, docs)
+    rate_store = TaxRateStore.from_counties(counties)
+    return {
+        record.deed.doc: enrich_and_validate(record.deed, counties, verbose=False, rate_store=rate_store)
+        for record in records
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Re-run enrichment and validation over stored extractions.")
+    parser.add_argument("--store", default=EXTRACTION_STORE_FILE, help="Extraction store (JSON lines)")
+    parser.add_argument("--all", action="store_true", help="Replay every stored deed")
+    parser.add_argument("--county", action="append", default=[], help="Replay deeds in this county (repeatable)")
+    parser.add_argument("--doc", action="append", default=[], help="Replay this document number (repeatable)")
+    parser.add_argument("--changed-since", metavar="OLD_COUNTIES",
+                        help="Replay deeds in counties whose rate differs from this older counties file")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    counties = load_counties()
+    county_names: Optional[Set[str]] = set(args.county) or None
+    if args.changed_since:
+        old = [County(**item) for item in json.loads(Path(args.changed_since).read_text())]
+        county_names = (county_names or set()) | changed_counties(old, counties)
+    docs: Optional[Set[str]] = set(args.doc) or None
+
+    if not args.all and county_names is None and docs is None:
+        parser.error("nothing selected: pass --all, --county, --doc or --changed-since")
+
+    results = replay(ExtractionStore(args.store), counties, county_names, docs)
+
+    if args.json:
+        print(json.dumps({doc: r.model_dump() for doc, r in results.items()}, indent=2, default=str))
+    else:
+        for doc, result in results.items():
+            if result.passed:
+                print(f"PASS  {doc}  closing cost ${result.closing_cost:,.2f}")
+            else:
+                print(f"FAIL  {doc}  {', '.join(e.error_type for e in result.errors)}")
+        failed = sum(1 for r in results.values() if not r.passed)
+        print(f"\nReplayed {len(results)} deeds: {len(results) - failed} passed, {failed} failed")
+
+    sys.exit(0 if all(r.passed for r in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# Append-only store of LLM extractions, so enrichment and validation can be replayed without new LLM calls.
+
+import hashlib
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+from src.config import EXTRACTION_STORE_FILE, OPENAI_MODEL
+from src.dedup.minhash import minhash_signature
+from src.models import ExtractedDeed, ExtractionRecord, Provenance
+
+
+def text_sha256(raw_text: str) -> str:
+    return hashlib.sha256(raw_text.encode("utf-8")).hexdigest()
+
+
+class ExtractionStore:
+    def __init__(self, path: str = EXTRACTION_STORE_FILE):
+        self.path = Path(path)
+
+    def append(
+        self,
+        raw_text: str,
+        deed: ExtractedDeed,
+        model: str = OPENAI_MODEL,
+        source: str = "llm",
+    ) -> ExtractionRecord:
+        # Records are only ever appended; a re-extraction of the same doc adds a newer line.
+        record = ExtractionRecord(
+            deed=deed,
+            provenance=Provenance(
+                text_sha256=text_sha256(raw_text),
+                raw_text=raw_text,
+                model=model,
+                extracted_at=datetime.now(timezone.utc).isoformat(),
+                source=source,
+                # Stored so the dedup index is loaded, not recomputed, by every new process
+                minhash=minhash_signature(raw_text),
+            ),
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            # Several worker processes may append to the same store
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            f.write(record.model_dump_json() + "\n")
+        return record
+
+    def __iter__(self) -> Iterator[ExtractionRecord]:
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield ExtractionRecord.model_validate_json(line)
+
+    def size(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def read_from(self, offset: int = 0) -> Iterator[Tuple[ExtractionRecord, int]]:
+        # Records appended after byte offset, each with the offset to continue from; lets the
+        # in-memory indexes pick up what other processes appended since they last looked.
+        if self.size() <= offset:
+            return
+        with open(self.path, "rb") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_SH)
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return  # never a line still being written
+                offset += len(line)
+                if line.strip():
+                    yield ExtractionRecord.model_validate_json(line), offset
+
+    def latest_by_doc(self) -> Dict[str, ExtractionRecord]:
+        # Latest extraction per document number (later lines win).
+        latest: Dict[str, ExtractionRecord] = {}
+        for record in self:
+            latest[record.deed.doc] = record
+        return latest
+
+
+_store_instance: Optional[ExtractionStore] = None
+_instance_lock = threading.Lock()
+
+
+def get_extraction_store() -> ExtractionStore:
+    global _store_instance
+
+    with _instance_lock:
+        if _store_instance is None:
+            _store_instance = ExtractionStore()
+
+    return _store_instance
@@ -0,0 +1,204 @@
+"""
+Self-learning layout templates.
+
+Cached LLM extractions are aligned with their OCR text to learn, per recorder
+layout, which label anchors each field and how its value span is read.
+Incoming deeds whose layout fingerprint matches a trusted template are
+extracted locally; everything else, and a sample of local extractions, still
+goes to the LLM, and every LLM extraction updates the template's agreement.
+
+Templates are learned by following the extraction store, so every worker
+process observes the LLM extractions of all the others. templates.json is
+a snapshot with the store offset it covers, so a new process only catches
+up on what was appended after it.
+
+    python -m src.templates.induction    # (re)learn templates from the extraction store
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.config import (
+    TEMPLATE_STORE_FILE, TEMPLATE_MIN_OBSERVATIONS, TEMPLATE_MIN_AGREEMENT, TEMPLATE_AUDIT_EVERY,
+    TEMPLATE_SAVE_EVERY,
+)
+from src.llm.extractor import REQUIRED_FIELDS, find_invalid_fields
+from src.models import ExtractedDeed, FieldRule, LayoutTemplate
+from src.store.extractions import ExtractionStore, get_extraction_store
+from src.templates.layout import first_segment, layout_fingerprint, read_span, segments
+from src.utils.similarity import values_agree
+
+_SPAN_KINDS = ("text", "date", "money", "paren")
+
+
+def align(raw_text: str, deed: ExtractedDeed) -> Dict[str, FieldRule]:
+    # For each field, the first segment whose value span reproduces what the LLM extracted.
+    segs = segments(raw_text)
+    rules: Dict[str, FieldRule] = {}
+    for field, expected in deed.model_dump().items():
+        for label, value in segs:
+            kind = next((k for k in _SPAN_KINDS if values_agree(read_span(value, k), expected)), None)
+            if kind is not None:
+                rules[field] = FieldRule(label=label, kind=kind)
+                break
+    return rules
+
+
+def apply_template(template: LayoutTemplate, raw_text: str) -> Optional[dict]:
+    # Extract every field with the template, or None if any anchor or span is missing.
+    segs = segments(raw_text)
+    data = {}
+    for field in REQUIRED_FIELDS:
+        rule = template.rules.get(field)
+        if rule is None:
+            return None
+        value = first_segment(segs, rule.label)
+        span = read_span(value, rule.kind) if value is not None else None
+        if span is None:
+            return None
+        data[field] = span
+    return data if not find_invalid_fields(data) else None
+
+
+def is_trusted(template: LayoutTemplate) -> bool:
+    return (
+        all(field in template.rules for field in REQUIRED_FIELDS)
+        and template.observations >= TEMPLATE_MIN_OBSERVATIONS
+        and template.agreement_rate >= TEMPLATE_MIN_AGREEMENT
+    )
+
+
+class TemplateStore:
+    def __init__(self, path: str = TEMPLATE_STORE_FILE):
+        self.path = Path(path)
+        self.templates: Dict[str, LayoutTemplate] = {}
+        # Byte offset of the extraction store up to which LLM extractions have been observed
+        self.offset = 0
+        # Set by observe; local_extractions only drives audit sampling and is not worth a rewrite
+        self.dirty = False
+        self.unsaved = 0
+        # Guards templates against concurrent extraction threads; reentrant because sync observes and saves
+        self._lock = threading.RLock()
+        if self.path.exists():
+            snapshot = json.loads(self.path.read_text())
+            # A snapshot without an offset (older format) is relearned from the store instead
+            if isinstance(snapshot, dict):
+                self.offset = snapshot["offset"]
+                for item in snapshot["templates"]:
+                    template = LayoutTemplate(**item)
+                    self.templates[template.fingerprint] = template
+
+    def save(self) -> None:
+        with self._lock:
+            if not self.dirty:
+                return
+            snapshot = {"offset": self.offset, "templates": [t.model_dump() for t in self.templates.values()]}
+            self.dirty = False
+            self.unsaved = 0
+        # Write-then-rename so a concurrent reader never sees a half-written file. Every process
+        # learns the same templates from the same store prefix, so the last writer loses nothing.
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(snapshot, indent=2))
+        os.replace(tmp, self.path)
+
+    def sync(self, extraction_store: ExtractionStore) -> None:
+        # Observe the LLM extractions appended to the store since the last sync, by any process.
+        with self._lock:
+            if extraction_store.size() < self.offset:
+                # The store was replaced: relearn from scratch
+                self.templates.clear()
+                self.offset = 0
+                self.dirty = True
+            for record, self.offset in extraction_store.read_from(self.offset):
+                if record.provenance.source == "llm":
+                    self.observe(record.provenance.raw_text, record.deed)
+                    self.unsaved += 1
+            due = self.unsaved >= TEMPLATE_SAVE_EVERY
+        if due:
+            self.save()
+
+    def observe(self, raw_text: str, deed: ExtractedDeed) -> LayoutTemplate:
+        # Compare an LLM extraction with the layout's template, then learn from it.
+        fingerprint = layout_fingerprint(raw_text)
+        learned = align(raw_text, deed)
+        with self._lock:
+            template = self.templates.get(fingerprint)
+            self.dirty = True
+
+            if template is None:
+                # Nothing was compared yet: trust needs TEMPLATE_MIN_OBSERVATIONS real comparisons
+                template = self.templates[fingerprint] = LayoutTemplate(fingerprint=fingerprint, rules=learned)
+                return template
+
+            predicted = apply_template(template, raw_text)
+            agreed = predicted is not None and all(
+                values_agree(predicted[field], getattr(deed, field)) for field in REQUIRED_FIELDS
+            )
+            template.observations += 1
+            template.agreements += int(agreed)
+            if not agreed:
+                # Re-anchor only the fields this observation disagrees with
+                for field, rule in learned.items():
+                    if predicted is None or not values_agree(predicted.get(field), getattr(deed, field)):
+                        template.rules[field] = rule
+            return template
+
+    def extract(self, raw_text: str) -> Optional[Tuple[ExtractedDeed, LayoutTemplate]]:
+        # Local extraction for a trusted layout; None means use the LLM (unknown layout,
+        # low confidence, or this deed was sampled to audit the template).
+        with self._lock:
+            template = self.templates.get(layout_fingerprint(raw_text))
+            if template is None or not is_trusted(template):
+                return None
+            data = apply_template(template, raw_text)
+            if data is None:
+                return None
+            template.local_extractions += 1
+            if template.local_extractions % TEMPLATE_AUDIT_EVERY == 0:
+                return None
+            return ExtractedDeed(**data), template
+
+
+def induce_from_store(extraction_store: ExtractionStore, template_store: "TemplateStore") -> List[LayoutTemplate]:
+    # Relearn every template from the whole store.
+    template_store.templates.clear()
+    template_store.offset = 0
+    template_store.dirty = True
+    template_store.sync(extraction_store)
+    return list(template_store.templates.values())
+
+
+_store_instance: Optional[TemplateStore] = None
+_instance_lock = threading.Lock()
+
+
+def get_template_store() -> TemplateStore:
+    global _store_instance
+
+    with _instance_lock:
+        if _store_instance is None:
+            _store_instance = TemplateStore()
+    _store_instance.sync(get_extraction_store())
+
+    return _store_instance
+
+
+def main():
+    template_store = TemplateStore()
+    templates = induce_from_store(get_extraction_store(), template_store)
+    template_store.save()
+
+    for template in templates:
+        status = "trusted" if is_trusted(template) else "learning"
+        print(
+            f"{template.fingerprint}  {status:8}  {len(template.rules)}/{len(REQUIRED_FIELDS)} fields  "
+            f"agreement {template.agreements}/{template.observations}"
+        )
+    print(f"\n{len(templates)} layouts learned")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# Layout analysis of OCR text: "Label: value" segments and a fingerprint of the label sequence.
+
+import hashlib
+import re
+from typing import List, Optional, Tuple
+
+from src.utils.dates import parse_date
+
+_WHITESPACE = re.compile(r'\s+')
+_MONEY = re.compile(r'\$\s*([\d,]+(?:\.\d+)?)')
+_PAREN = re.compile(r'\(([^()]*)\)')
+
+
+def collapse(text: str) -> str:
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def segments(raw_text: str) -> List[Tuple[str, str]]:
+    # (normalized label, value) for every "Label: value" segment; '|' separates segments on one line.
+    found = []
+    for line in raw_text.splitlines():
+        for part in line.split('|'):
+            if ':' in part:
+                label, value = part.split(':', 1)
+                label = collapse(label).lower()
+                if label:
+                    found.append((label, collapse(value)))
+    return found
+
+
+def layout_fingerprint(raw_text: str) -> str:
+    labels = "\n".join(label for label, _ in segments(raw_text))
+    return hashlib.sha1(labels.encode("utf-8")).hexdigest()[:16]
+
+
+def read_span(value: str, kind: str):
+    # Pull a typed value out of a segment; None when the segment does not have that shape.
+    if kind == "text":
+        return value or None
+    if kind == "date":
+        try:
+            return parse_date(value).isoformat()
+        except ValueError:
+            return None
+    if kind == "money":
+        match = _MONEY.search(value)
+        return float(match.group(1).replace(',', '')) if match else None
+    if kind == "paren":
+        match = _PAREN.search(value)
+        return collapse(match.group(1)) if match and match.group(1).strip() else None
+    raise ValueError(f"Unknown span kind: '{kind}'")
+
+
+def first_segment(raw_text_segments: List[Tuple[str, str]], label: str) -> Optional[str]:
+    for seg_label, value in raw_text_segments:
+        if seg_label == label:
+            return value
+    return None
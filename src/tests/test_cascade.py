@@ -0,0 +1,95 @@
+# Unit tests for the cheap-then-strong model cascade.
+
+import pytest
+from src.llm.cascade import find_suspect_fields, run_cascade
+from src.models import County, ExtractedDeed
+from src.validate.errors import ExtractionError
+
+COUNTIES = [
+    County(name="Santa Clara", tax_rate=0.012),
+    County(name="San Mateo", tax_rate=0.011),
+]
+
+GOOD_DEED = ExtractedDeed(
+    doc="DEED-TRUST-0042", county_raw="S. Clara", state="CA",
+    date_signed="2024-01-10", date_recorded="2024-01-15",
+    grantor="A", grantee="B",
+    amount_numeric=1_200_000.0, amount_words="One Million Two Hundred Thousand Dollars",
+    apn="992-001-XA", status="FINAL",
+)
+
+
+class FakeClient:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.temperatures = []
+
+    def extract_json(self, prompt, temperature=0.0):
+        self.temperatures.append(temperature)
+        return self.responses.pop(0), {}
+
+
+class TestSuspectFields:
+    def test_clean_deed_has_no_suspects(self):
+        assert find_suspect_fields(GOOD_DEED.model_dump(), COUNTIES) == {}
+
+    def test_amount_mismatch_flags_both_amount_fields(self):
+        fields = dict(GOOD_DEED.model_dump(), amount_numeric=1_250_000.0)
+        assert set(find_suspect_fields(fields, COUNTIES)) == {"amount_numeric", "amount_words"}
+
+    def test_bad_dates(self):
+        fields = dict(GOOD_DEED.model_dump(), date_recorded="2024-01-01")
+        assert set(find_suspect_fields(fields, COUNTIES)) == {"date_signed", "date_recorded"}
+        fields = dict(GOOD_DEED.model_dump(), date_signed="2024-31-31")
+        assert set(find_suspect_fields(fields, COUNTIES)) == {"date_signed"}
+
+    def test_fuzzy_county_match_is_suspect(self):
+        fields = dict(GOOD_DEED.model_dump(), county_raw="Santa Clora")
+        assert "county_raw" in find_suspect_fields(fields, COUNTIES)
+
+    def test_partial_fields(self):
+        assert find_suspect_fields({"date_signed": "2024-01-10"}, COUNTIES) == {}
+
+
+class TestCascade:
+    def test_common_path_makes_no_extra_calls(self):
+        client = FakeClient([])
+        deed, report = run_cascade("raw", GOOD_DEED, COUNTIES, client=client)
+        assert deed == GOOD_DEED
+        assert report.escalated_calls == 0
+
+    def test_agreeing_strong_read_confirms_fraud(self):
+        cheap = GOOD_DEED.model_copy(update={"amount_numeric": 1_250_000.0})
+        client = FakeClient([{"amount_numeric": 1_250_000.0, "amount_words": GOOD_DEED.amount_words}])
+        deed, report = run_cascade("raw", cheap, COUNTIES, client=client)
+        assert deed.amount_numeric == 1_250_000.0
+        assert sorted(report.confirmed) == ["amount_numeric", "amount_words"]
+        assert report.escalated_calls == 1
+
+    def test_misread_is_corrected_by_two_strong_reads(self):
+        cheap = GOOD_DEED.model_copy(update={"amount_numeric": 1_250_000.0})
+        reread = {"amount_numeric": 1_200_000.0, "amount_words": GOOD_DEED.amount_words}
+        client = FakeClient([reread, {"amount_numeric": 1_200_000.0}])
+        deed, report = run_cascade("raw", cheap, COUNTIES, client=client)
+        assert deed.amount_numeric == 1_200_000.0
+        assert report.corrected == ["amount_numeric"]
+        assert client.temperatures[1] > 0
+
+    def test_tie_break_can_side_with_cheap_read(self):
+        cheap = GOOD_DEED.model_copy(update={"date_recorded": "2024-01-01"})
+        client = FakeClient([
+            {"date_signed": "2024-01-10", "date_recorded": "2024-01-21"},
+            {"date_recorded": "2024-01-01"},
+        ])
+        deed, report = run_cascade("raw", cheap, COUNTIES, client=client)
+        assert deed.date_recorded == "2024-01-01"
+        assert sorted(report.confirmed) == ["date_recorded", "date_signed"]
+
+    def test_no_two_reads_agree(self):
+        cheap = GOOD_DEED.model_copy(update={"date_recorded": "2024-01-01"})
+        client = FakeClient([
+            {"date_signed": "2024-01-10", "date_recorded": "2024-01-21"},
+            {"date_recorded": "2024-01-22"},
+        ])
+        with pytest.raises(ExtractionError):
+            run_cascade("raw", cheap, COUNTIES, client=client)
@@ -2,8 +2,10 @@
 
 import pytest
 from src.models import County
-from src.enrich.county_resolver import resolve_county
-from src.enrich.normalizer import normalize_county_name, expand_abbreviations
+from src.enrich.county_resolver import get_county_index, get_reference_data, resolve_county
+from src.enrich.normalizer import (
+    CountyIndex, OCR_VARIANT_CONFIDENCE, normalize_county_name, expand_abbreviations, ocr_skeleton
+)
 from src.validate.errors import CountyMatchError
 
 SAMPLE_COUNTIES = [
@@ -95,3 +97,49 @@ class TestCountyResolution:
             assert name == county.name
             assert tax_rate == county.tax_rate
             assert confidence == 1.0
+
+
+class TestOCRVariants:
+    # Tests for OCR-damaged county names resolved without fuzzy scoring.
+    def test_ocr_skeleton_folds_confusions(self):
+        assert ocr_skeleton("Sant4 C1ara") == ocr_skeleton("Santa Clara")
+        assert ocr_skeleton("SantaClara") == ocr_skeleton("santa clara")
+        assert ocr_skeleton("San Mate0") == ocr_skeleton("San Mateo")
+
+    def test_expand_drops_stray_periods(self):
+        assert expand_abbreviations("S. Clara Co.") == "santa clara co"
+
+    def test_resolve_digit_confusions(self):
+        name, tax_rate, confidence = resolve_county("Sant4 C1ara", SAMPLE_COUNTIES)
+        assert name == "Santa Clara"
+        assert tax_rate == 0.012
+        assert confidence == OCR_VARIANT_CONFIDENCE
+
+    def test_resolve_dropped_spaces(self):
+        name, _, _ = resolve_county("SantaCruz", SAMPLE_COUNTIES)
+        assert name == "Santa Cruz"
+
+    def test_resolve_abbreviation_without_space(self):
+        name, _, _ = resolve_county("S.Clara", SAMPLE_COUNTIES)
+        assert name == "Santa Clara"
+
+    def test_resolve_county_suffix(self):
+        name, _, confidence = resolve_county("Santa Clara County", SAMPLE_COUNTIES)
+        assert name == "Santa Clara"
+        assert confidence == 1.0
+
+    def test_index_lookup_miss(self):
+        assert CountyIndex(SAMPLE_COUNTIES).lookup("Unknown County") is None
+
+
+class TestCountyIndexCache:
+
+    def test_reference_data_index_is_reused(self):
+        counties, _ = get_reference_data()
+        assert get_county_index(counties) is get_county_index(counties)
+
+    def test_each_list_gets_its_own_index(self):
+        first = [County(name="Santa Clara", tax_rate=0.012)]
+        second = [County(name="San Mateo", tax_rate=0.011)]
+        assert get_county_index(first).lookup("Santa Clara") is not None
+        assert get_county_index(second).lookup("Santa Clara") is None
@@ -0,0 +1,136 @@
+# Unit tests for duplicate detection.
+
+import pytest
+from src.dedup import index as dedup_index
+from src.dedup.index import DedupIndex, ParcelIndex, StoreIndexes, build_indexes
+from src.dedup.minhash import estimate_jaccard, minhash_signature
+from src.main import RAW_OCR_TEXT
+from src.models import ExtractedDeed, ExtractionRecord, Provenance
+from src.store.extractions import ExtractionStore
+from src.validate.errors import DuplicateRecordingError
+
+
+def make_deed(doc: str = "DEED-TRUST-0042", apn: str = "992-001-XA", recorded: str = "2024-01-10") -> ExtractedDeed:
+    return ExtractedDeed(
+        doc=doc, county_raw="S. Clara", state="CA",
+        date_signed="2024-01-15", date_recorded=recorded,
+        grantor="A", grantee="B",
+        amount_numeric=1_250_000.0, amount_words="One Million Two Hundred Thousand Dollars",
+        apn=apn, status="PRELIMINARY",
+    )
+
+
+def make_record(raw_text: str) -> ExtractionRecord:
+    return ExtractionRecord(
+        deed=make_deed(),
+        provenance=Provenance(text_sha256="x", raw_text=raw_text, model="m", extracted_at="t"),
+    )
+
+
+class TestMinHash:
+    def test_identical_text_has_identical_signature(self):
+        assert estimate_jaccard(minhash_signature(RAW_OCR_TEXT), minhash_signature(RAW_OCR_TEXT)) == 1.0
+
+    def test_unrelated_text_is_dissimilar(self):
+        other = "Completely different document about something else entirely."
+        assert estimate_jaccard(minhash_signature(RAW_OCR_TEXT), minhash_signature(other)) < 0.2
+
+
+class TestDedupIndex:
+    def test_exact_match_ignores_whitespace(self):
+        index = DedupIndex()
+        index.add(make_record(RAW_OCR_TEXT))
+        match = index.find(RAW_OCR_TEXT.replace("  ", " ") + "\n")
+        assert match is not None
+        assert match.kind == "exact"
+
+    def test_ocr_rescan_reuses_extraction(self):
+        index = DedupIndex()
+        index.add(make_record(RAW_OCR_TEXT))
+        rescan = RAW_OCR_TEXT.replace("Holdings", "Ho1dings").replace("PRELIMINARY", "PREL1MINARY")
+        match = index.find(rescan)
+        assert match.kind == "rescan"
+        assert match.reusable
+        assert match.record.deed.doc == "DEED-TRUST-0042"
+
+    @pytest.mark.parametrize("old, new", [
+        ("$1,250,000.00", "$1,200,000.00"),
+        ("Two Hundred Thousand", "Two Hundred Fifty Thousand"),
+        ("Sarah", "Kyle"),
+        ("S. Clara", "San Mateo"),
+        ("$1,250,000.00", "$12,500,000.0"),
+    ])
+    def test_edited_resubmission_is_never_reused(self, old, new):
+        index = DedupIndex()
+        index.add(make_record(RAW_OCR_TEXT))
+        match = index.find(RAW_OCR_TEXT.replace(old, new))
+        assert match is None or not match.reusable
+
+    def test_near_match_is_reported(self):
+        index = DedupIndex()
+        index.add(make_record(RAW_OCR_TEXT))
+        match = index.find(RAW_OCR_TEXT.replace("Sarah", "Kyle"))
+        assert match.kind == "near"
+        assert match.record.deed.doc == "DEED-TRUST-0042"
+
+    def test_unrelated_document(self):
+        index = DedupIndex()
+        index.add(make_record(RAW_OCR_TEXT))
+        assert index.find("Doc: OTHER-1\nCounty: San Mateo") is None
+
+
+class TestBuildIndexes:
+    def test_stored_signatures_are_not_recomputed(self, tmp_path, monkeypatch):
+        store = ExtractionStore(str(tmp_path / "extractions.jsonl"))
+        store.append(RAW_OCR_TEXT, make_deed())
+
+        def no_recompute(text):
+            raise AssertionError("signature recomputed")
+
+        monkeypatch.setattr(dedup_index, "minhash_signature", no_recompute)
+        dedup, _ = build_indexes(store)
+        assert dedup.find(RAW_OCR_TEXT).kind == "exact"
+
+
+class TestStoreIndexes:
+    def test_appends_by_other_processes_are_seen(self, tmp_path):
+        path = str(tmp_path / "extractions.jsonl")
+        indexes = StoreIndexes(ExtractionStore(path))
+        indexes.sync()
+        # Another worker appends to the shared store
+        ExtractionStore(path).append(RAW_OCR_TEXT, make_deed(doc="D-1"))
+
+        indexes.sync()
+        assert indexes.dedup.find(RAW_OCR_TEXT).kind == "exact"
+        assert isinstance(indexes.parcels.check(make_deed(doc="D-2")), DuplicateRecordingError)
+
+    def test_replaced_store_is_reread(self, tmp_path):
+        store = ExtractionStore(str(tmp_path / "extractions.jsonl"))
+        store.append(RAW_OCR_TEXT, make_deed(doc="D-1"))
+        indexes = StoreIndexes(store)
+        indexes.sync()
+        store.path.write_text("")
+        store.append("Doc: OTHER-1", make_deed(doc="D-9"))
+
+        indexes.sync()
+        assert indexes.dedup.find(RAW_OCR_TEXT) is None
+        assert indexes.dedup.find("Doc: OTHER-1") is not None
+
+
+class TestParcelIndex:
+    def test_same_parcel_different_doc_within_window(self):
+        parcels = ParcelIndex(window_days=90)
+        parcels.add(make_deed(doc="D-1", recorded="2024-01-10"))
+        error = parcels.check(make_deed(doc="D-2", apn="992 001 xa", recorded="2024-02-01"))
+        assert isinstance(error, DuplicateRecordingError)
+        assert "D-1" in str(error)
+
+    def test_resubmission_of_same_doc_is_not_flagged(self):
+        parcels = ParcelIndex()
+        parcels.add(make_deed(doc="D-1"))
+        assert parcels.check(make_deed(doc="D-1")) is None
+
+    def test_outside_window_is_not_flagged(self):
+        parcels = ParcelIndex(window_days=90)
+        parcels.add(make_deed(doc="D-1", recorded="2022-01-10"))
+        assert parcels.check(make_deed(doc="D-2", recorded="2024-01-10")) is None
@@ -0,0 +1,163 @@
+# Unit tests for field-level repair of LLM extractions.
+
+import pytest
+from src.llm import client as llm_client, extractor
+from src.llm.extractor import build_deed, find_invalid_fields, get_repair_stats, reset_repair_stats
+from src.validate.errors import ExtractionError, LLMServiceError, MissingFieldError
+
+RAW_TEXT = "Doc: DEED-TRUST-0042\nAPN: 992-001-XA"
+
+FULL_DATA = {
+    "doc": "DEED-TRUST-0042",
+    "county_raw": "S. Clara",
+    "state": "CA",
+    "date_signed": "2024-01-15",
+    "date_recorded": "2024-01-20",
+    "grantor": "T.E.S.L.A. Holdings LLC",
+    "grantee": "John & Sarah Connor",
+    "amount_numeric": 1_250_000.0,
+    "amount_words": "One Million Two Hundred Fifty Thousand Dollars",
+    "apn": "992-001-XA",
+    "status": "PRELIMINARY",
+}
+
+
+class FakeClient:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def extract_json(self, prompt, temperature=0.0):
+        self.prompts.append(prompt)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response, {"prompt_tokens": 100, "completion_tokens": 10}
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    reset_repair_stats()
+
+
+class TestFindInvalidFields:
+    def test_complete_data_is_valid(self):
+        assert find_invalid_fields(FULL_DATA) == {}
+
+    def test_missing_and_ill_typed_fields(self):
+        data = dict(FULL_DATA, amount_numeric="lots")
+        del data["apn"]
+        problems = find_invalid_fields(data)
+        assert problems["apn"] == "missing"
+        assert "amount_numeric" in problems
+        assert len(problems) == 2
+
+
+class TestRepairPass:
+    def test_repairs_only_broken_fields(self):
+        data = dict(FULL_DATA, amount_numeric=None)
+        del data["apn"]
+        client = FakeClient([{"apn": "992-001-XA", "amount_numeric": 1_250_000.0, "doc": "WRONG"}])
+
+        deed = build_deed(RAW_TEXT, data, client=client)
+
+        assert deed.apn == "992-001-XA"
+        assert deed.amount_numeric == 1_250_000.0
+        assert deed.doc == "DEED-TRUST-0042"
+        assert '"apn"' in client.prompts[0]
+        assert '"grantor"' not in client.prompts[0]
+
+    def test_stats_report_recovery_and_tokens(self):
+        data = dict(FULL_DATA)
+        del data["status"]
+        build_deed(RAW_TEXT, data, client=FakeClient([{"status": "FINAL"}]))
+
+        stats = get_repair_stats()
+        assert stats.attempts == 1
+        assert stats.recovery_rate == 1.0
+        assert stats.extra_tokens == 110
+
+    def test_unrecovered_field_still_raises(self):
+        data = dict(FULL_DATA)
+        del data["apn"]
+        with pytest.raises(MissingFieldError):
+            build_deed(RAW_TEXT, data, client=FakeClient([{}]))
+        assert get_repair_stats().recovered == 0
+
+    def test_failed_repair_adds_no_tokens(self):
+        data = dict(FULL_DATA)
+        del data["apn"]
+        with pytest.raises(ExtractionError):
+            build_deed(RAW_TEXT, data, client=FakeClient([ExtractionError("rate limited")]))
+        assert get_repair_stats().extra_tokens == 0
+
+    def test_repair_disabled_raises_immediately(self):
+        data = dict(FULL_DATA)
+        del data["apn"]
+        with pytest.raises(MissingFieldError):
+            build_deed(RAW_TEXT, data, client=FakeClient([]), repair=False)
+
+    def test_valid_response_makes_no_extra_call(self, monkeypatch):
+        client = FakeClient([dict(FULL_DATA)])
+        monkeypatch.setattr(extractor, "get_llm_client", lambda: client)
+
+        deed = extractor.extract_deed_fields(RAW_TEXT)
+
+        assert deed.doc == "DEED-TRUST-0042"
+        assert len(client.prompts) == 1
+        assert get_repair_stats().attempts == 0
+
+
+class TestClientSetup:
+    @pytest.fixture(autouse=True)
+    def no_client(self, monkeypatch):
+        def unconfigured(model=None):
+            raise ValueError("OpenAI API key not provided.")
+
+        monkeypatch.setattr(llm_client, "_client_instances", {})
+        monkeypatch.setattr(llm_client, "LLMClient", unconfigured)
+
+    def test_missing_client_is_a_service_error(self):
+        with pytest.raises(LLMServiceError):
+            extractor.extract_deed_fields(RAW_TEXT)
+
+    def test_missing_client_is_a_service_error_when_streaming(self):
+        with pytest.raises(LLMServiceError):
+            extractor.extract_deed_fields_streaming(RAW_TEXT)
+
+
+class APIError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+
+
+class FailingCompletions:
+    def __init__(self, error):
+        self.error = error
+
+    def create(self, **kwargs):
+        raise self.error
+
+
+def failing_client(error) -> llm_client.LLMClient:
+    client = llm_client.LLMClient.__new__(llm_client.LLMClient)
+    client.model = "test-model"
+    client.client = type("OpenAI", (), {"chat": type("Chat", (), {"completions": FailingCompletions(error)})})
+    return client
+
+
+class TestAPIErrors:
+    @pytest.mark.parametrize("error", [APIError(429), APIError(503), TimeoutError(), ConnectionError()])
+    def test_transient_failures_are_retried(self, error):
+        with pytest.raises(LLMServiceError):
+            failing_client(error).extract_json("prompt")
+
+    @pytest.mark.parametrize("error", [APIError(400), APIError(401), ValueError("context length exceeded")])
+    def test_rejected_requests_are_final(self, error):
+        with pytest.raises(ExtractionError) as raised:
+            failing_client(error).extract_json("prompt")
+        assert not isinstance(raised.value, LLMServiceError)
+        with pytest.raises(ExtractionError) as raised:
+            list(failing_client(error).stream_json("prompt"))
+        assert not isinstance(raised.value, LLMServiceError)
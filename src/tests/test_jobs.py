@@ -0,0 +1,188 @@
+# Unit tests for the durable job queue and its workers.
+
+import json
+
+import pytest
+from src import main
+from src.dedup.index import StoreIndexes
+from src.jobs import worker
+from src.jobs.queue import JobQueue
+from src.store.extractions import ExtractionStore
+from src.models import ExtractedDeed
+from src.validate.errors import ExtractionError, LLMServiceError
+
+RAW_TEXT = "Doc: DEED-TRUST-0099\nCounty: Santa Clara"
+
+DEED = ExtractedDeed(
+    doc="DEED-TRUST-0099", county_raw="Santa Clara", state="CA",
+    date_signed="2024-01-10", date_recorded="2024-01-15",
+    grantor="A", grantee="B",
+    amount_numeric=1_000_000.0, amount_words="One Million Dollars",
+    apn="JOBS-TEST-1", status="FINAL",
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes(tmp_path, monkeypatch):
+    # The parcel check must not see deeds validated by earlier tests or stored in the working directory
+    indexes = StoreIndexes(ExtractionStore(str(tmp_path / "extractions.jsonl")))
+    monkeypatch.setattr(main, "get_dedup_indexes", indexes.sync)
+    return indexes
+
+
+@pytest.fixture(autouse=True)
+def llm_client(monkeypatch):
+    # Workers check for a usable LLM client before leasing
+    monkeypatch.setattr(worker, "get_llm_client", lambda: object())
+
+
+@pytest.fixture
+def extract_calls(monkeypatch):
+    calls = []
+
+    def fake_extract(raw_text, verbose=True):
+        calls.append(raw_text)
+        return DEED
+
+    monkeypatch.setattr(worker, "extract_document", fake_extract)
+    return calls
+
+
+def make_queue(tmp_path, **kwargs) -> JobQueue:
+    return JobQueue(str(tmp_path / "jobs.db"), **kwargs)
+
+
+class TestJobQueue:
+    def test_enqueue_is_idempotent(self, tmp_path):
+        queue = make_queue(tmp_path)
+        first = queue.enqueue(RAW_TEXT)
+        second = queue.enqueue(RAW_TEXT)
+        assert first == (first[0], True)
+        assert second == (first[0], False)
+
+    def test_lease_is_exclusive(self, tmp_path):
+        queue = make_queue(tmp_path)
+        queue.enqueue(RAW_TEXT)
+        assert queue.lease("a") is not None
+        assert make_queue(tmp_path).lease("b") is None
+
+    def test_expired_lease_is_taken_over(self, tmp_path):
+        queue = make_queue(tmp_path, lease_seconds=-1)
+        queue.enqueue(RAW_TEXT)
+        queue.lease("a")
+        job = queue.lease("b")
+        assert job.attempts == 2
+        assert not queue.ack(job.id, "a", "{}")
+        assert queue.ack(job.id, "b", "{}")
+
+    def test_lease_order_is_earliest_deadline_first(self, tmp_path):
+        queue = make_queue(tmp_path)
+        queue.enqueue("backfill")
+        queue.enqueue("late", deadline=2000.0)
+        queue.enqueue("soon", deadline=1000.0)
+        queue.enqueue("soon, important", priority=5, deadline=1000.0)
+        leased = [queue.lease("w").raw_text for _ in range(4)]
+        assert leased == ["soon, important", "soon", "late", "backfill"]
+
+    def test_nack_retries_then_fails(self, tmp_path):
+        queue = make_queue(tmp_path, max_attempts=2)
+        queue.enqueue(RAW_TEXT)
+        job = queue.lease("a")
+        queue.nack(job.id, "a", "boom")
+        assert queue.counts() == {"pending": 1}
+        job = queue.lease("a")
+        queue.nack(job.id, "a", "boom")
+        assert queue.counts() == {"failed": 1}
+        assert queue.lease("a") is None
+
+
+class TestWorker:
+    def test_worker_drains_queue(self, tmp_path, extract_calls):
+        queue = make_queue(tmp_path)
+        queue.enqueue(RAW_TEXT)
+
+        assert worker.run_worker(queue.path, worker_id="w") == 1
+
+        (job_id, status, result), = queue.results()
+        assert status == "done"
+        assert json.loads(result)["passed"]
+        assert len(extract_calls) == 1
+
+    def test_same_parcel_twice_is_flagged(self, tmp_path, monkeypatch):
+        other = DEED.model_copy(update={"doc": "DEED-TRUST-0100"})
+        monkeypatch.setattr(worker, "extract_document",
+                            lambda raw_text, verbose=True: DEED if raw_text == RAW_TEXT else other)
+        queue = make_queue(tmp_path)
+        queue.enqueue(RAW_TEXT)
+        queue.enqueue("Doc: DEED-TRUST-0100\nCounty: Santa Clara")
+        worker.run_worker(queue.path, worker_id="w")
+        first, second = (json.loads(result) for _, _, result in queue.results())
+        assert first["passed"]
+        assert second["errors"][0]["error_type"] == "DuplicateRecordingError"
+
+    def test_resume_after_crash_reuses_extraction(self, tmp_path, extract_calls):
+        queue = make_queue(tmp_path, lease_seconds=-1)
+        job_id, _ = queue.enqueue(RAW_TEXT)
+        crashed = queue.lease("crashed")
+        queue.checkpoint(crashed.id, "screen", "passed")
+        queue.checkpoint(crashed.id, "extract", DEED.model_dump_json())
+
+        job = queue.lease("survivor")
+        worker.process_job(queue, job, "survivor")
+
+        assert extract_calls == []
+        assert queue.counts() == {"done": 1}
+
+    def test_llm_service_error_is_retried(self, tmp_path, monkeypatch):
+        def failing_extract(raw_text, verbose=True):
+            raise LLMServiceError("rate limited")
+
+        monkeypatch.setattr(worker, "extract_document", failing_extract)
+        queue = make_queue(tmp_path)
+        queue.enqueue(RAW_TEXT)
+        job = queue.lease("w")
+        assert worker.process_job(queue, job, "w")
+        assert queue.counts() == {"pending": 1}
+
+    def test_deterministic_extraction_error_is_final(self, tmp_path, monkeypatch):
+        def failing_extract(raw_text, verbose=True):
+            raise ExtractionError("Stronger model returned ill-typed fields")
+
+        monkeypatch.setattr(worker, "extract_document", failing_extract)
+        queue = make_queue(tmp_path)
+        queue.enqueue(RAW_TEXT)
+        worker.run_worker(queue.path, worker_id="w")
+        (_, status, result), = queue.results()
+        assert status == "done"
+        assert not json.loads(result)["passed"]
+
+    def test_worker_without_llm_client_leases_nothing(self, tmp_path, monkeypatch, extract_calls):
+        def unavailable():
+            raise LLMServiceError("LLM client unavailable: OpenAI API key not provided.")
+
+        monkeypatch.setattr(worker, "get_llm_client", unavailable)
+        queue = make_queue(tmp_path)
+        queue.enqueue(RAW_TEXT)
+        assert worker.run_worker(queue.path, worker_id="w") == 0
+        assert queue.counts() == {"pending": 1}
+        assert extract_calls == []
+
+    def test_lost_lease_stops_before_extraction(self, tmp_path, extract_calls):
+        queue = make_queue(tmp_path, lease_seconds=-1)
+        queue.enqueue(RAW_TEXT)
+        stale = queue.lease("slow")
+        queue.lease("new-owner")
+
+        assert not worker.process_job(queue, stale, "slow")
+        assert extract_calls == []
+        assert queue.get_checkpoint(stale.id, "screen") is None
+        assert queue.counts() == {"leased": 1}
+
+    def test_screening_failure_is_final(self, tmp_path, extract_calls):
+        queue = make_queue(tmp_path)
+        queue.enqueue("Date Signed: 2024-01-15\nDate Recorded: 2024-01-10")
+        worker.run_worker(queue.path, worker_id="w")
+        (_, status, result), = queue.results()
+        assert status == "done"
+        assert not json.loads(result)["passed"]
+        assert extract_calls == []
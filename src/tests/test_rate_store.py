@@ -0,0 +1,68 @@
+# Unit tests for effective-dated county tax rates.
+
+from datetime import date
+
+import pytest
+from src.models import County, CountyRate, ExtractedDeed
+from src.enrich.county_resolver import enrich_with_county
+from src.enrich.rate_store import TaxRateStore
+from src.validate.errors import TaxRateError
+
+COUNTIES = [
+    County(name="Santa Clara", state="CA", tax_rate=0.012, rates=[
+        CountyRate(effective_from="2023-07-01", tax_rate=0.012),
+        CountyRate(effective_from="2020-01-01", tax_rate=0.010),
+    ]),
+    County(name="San Mateo", tax_rate=0.011),
+]
+
+
+def make_deed(recorded: str) -> ExtractedDeed:
+    return ExtractedDeed(
+        doc="D-1", county_raw="S. Clara", state="CA",
+        date_signed="2019-01-01", date_recorded=recorded,
+        grantor="A", grantee="B",
+        amount_numeric=1_000_000.0, amount_words="One Million",
+        apn="1", status="FINAL",
+    )
+
+
+class TestTaxRateStore:
+    store = TaxRateStore.from_counties(COUNTIES)
+
+    def test_rate_in_force_on_date(self):
+        assert self.store.rate_on("CA", "Santa Clara", date(2021, 5, 1)) == 0.010
+        assert self.store.rate_on("CA", "Santa Clara", "2023-07-01") == 0.012
+        assert self.store.rate_on("ca", "santa clara", "2030-01-01") == 0.012
+
+    def test_date_before_history(self):
+        assert self.store.rate_on("CA", "Santa Clara", "2019-12-31") is None
+
+    def test_wrong_state_or_unknown_county(self):
+        assert self.store.rate_on("FL", "Santa Clara", "2024-01-01") is None
+        assert self.store.rate_on("CA", "Nowhere", "2024-01-01") is None
+
+    @pytest.mark.parametrize("state", ["California", "CA ", " c.a.", "", None, "C4"])
+    def test_state_spellings(self, state):
+        assert self.store.rate_on(state, "Santa Clara", "2024-01-01") == 0.012
+
+    def test_county_without_history_or_state(self):
+        assert self.store.rate_on("CA", "San Mateo", "1901-01-01") == 0.011
+
+
+class TestDatedEnrichment:
+    store = TaxRateStore.from_counties(COUNTIES)
+
+    def test_uses_rate_on_recording_date(self):
+        assert enrich_with_county(make_deed("2021-03-01"), COUNTIES, self.store).tax_rate == 0.010
+
+    def test_without_store_uses_current_rate(self):
+        assert enrich_with_county(make_deed("2021-03-01"), COUNTIES).tax_rate == 0.012
+
+    def test_full_state_name(self):
+        deed = make_deed("2021-03-01").model_copy(update={"state": "California"})
+        assert enrich_with_county(deed, COUNTIES, self.store).tax_rate == 0.010
+
+    def test_no_rate_in_force(self):
+        with pytest.raises(TaxRateError):
+            enrich_with_county(make_deed("2019-03-01"), COUNTIES, self.store)
@@ -0,0 +1,85 @@
+# Unit tests for the extraction store and replay.
+
+from src.models import County, ExtractedDeed
+from src.store.extractions import ExtractionStore, text_sha256
+from src.replay import changed_counties, replay
+
+COUNTIES = [
+    County(name="Santa Clara", tax_rate=0.012),
+    County(name="San Mateo", tax_rate=0.011),
+]
+
+
+def make_deed(doc: str, county_raw: str, words: str = "One Million Dollars") -> ExtractedDeed:
+    return ExtractedDeed(
+        doc=doc, county_raw=county_raw, state="CA",
+        date_signed="2024-01-10", date_recorded="2024-01-15",
+        grantor="A", grantee="B",
+        amount_numeric=1_000_000.0, amount_words=words,
+        apn="1", status="FINAL",
+    )
+
+
+def test_store_round_trip_keeps_provenance(tmp_path):
+    store = ExtractionStore(str(tmp_path / "x.jsonl"))
+    store.append("raw ocr", make_deed("D-1", "S. Clara"), model="m")
+
+    records = list(store)
+    assert len(records) == 1
+    assert records[0].deed.doc == "D-1"
+    assert records[0].provenance.text_sha256 == text_sha256("raw ocr")
+    assert records[0].provenance.model == "m"
+
+
+def test_latest_extraction_wins(tmp_path):
+    store = ExtractionStore(str(tmp_path / "x.jsonl"))
+    store.append("v1", make_deed("D-1", "S. Clara", words="Two Dollars"))
+    store.append("v2", make_deed("D-1", "S. Clara"))
+
+    latest = store.latest_by_doc()
+    assert latest["D-1"].deed.amount_words == "One Million Dollars"
+    assert len(list(store)) == 2
+
+
+def test_read_from_resumes_at_offset_and_skips_partial_line(tmp_path):
+    store = ExtractionStore(str(tmp_path / "x.jsonl"))
+    store.append("a", make_deed("D-1", "S. Clara"))
+    (_, offset), = store.read_from(0)
+    store.append("b", make_deed("D-2", "San Mateo"))
+    with open(store.path, "a", encoding="utf-8") as f:
+        f.write('{"deed": ')  # another process mid-append
+
+    (record, end), = store.read_from(offset)
+    assert record.deed.doc == "D-2"
+    assert list(store.read_from(end)) == []
+
+
+def test_empty_store(tmp_path):
+    assert list(ExtractionStore(str(tmp_path / "missing.jsonl"))) == []
+
+
+def test_replay_only_affected_county(tmp_path):
+    store = ExtractionStore(str(tmp_path / "x.jsonl"))
+    store.append("a", make_deed("D-1", "S. Clara"))
+    store.append("b", make_deed("D-2", "San Mateo"))
+
+    results = replay(store, COUNTIES, county_names={"Santa Clara"})
+
+    assert list(results) == ["D-1"]
+    assert results["D-1"].passed
+    assert results["D-1"].closing_cost == 12_000.0
+
+
+def test_replay_uses_current_rates(tmp_path):
+    store = ExtractionStore(str(tmp_path / "x.jsonl"))
+    store.append("a", make_deed("D-1", "S. Clara"))
+    new_rates = [County(name="Santa Clara", tax_rate=0.02), COUNTIES[1]]
+
+    results = replay(store, new_rates, docs={"D-1"})
+
+    assert results["D-1"].closing_cost == 20_000.0
+
+
+def test_changed_counties():
+    new = [County(name="Santa Clara", tax_rate=0.02), COUNTIES[1], County(name="Santa Cruz", tax_rate=0.01)]
+    assert changed_counties(COUNTIES, new) == {"Santa Clara", "Santa Cruz"}
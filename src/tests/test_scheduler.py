@@ -0,0 +1,121 @@
+# Unit tests for the deadline-aware scheduler.
+
+import threading
+import time
+
+import pytest
+from src.jobs import scheduler as scheduler_module
+from src.jobs.scheduler import DeedScheduler
+from src.models import ExtractedDeed, ValidationResult
+
+DEED = ExtractedDeed(
+    doc="DEED-TRUST-0100", county_raw="Santa Clara", state="CA",
+    date_signed="2024-01-10", date_recorded="2024-01-15",
+    grantor="A", grantee="B",
+    amount_numeric=1_000_000.0, amount_words="One Million Dollars",
+    apn="SCHED-TEST-1", status="FINAL",
+)
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    # Extraction blocks until released, so tests control what is in flight
+    state = {"order": [], "release": threading.Event()}
+
+    def fake_extract(raw_text, verbose=True):
+        state["order"].append(raw_text)
+        state["release"].wait(5)
+        return DEED
+
+    def fake_validate(extracted, verbose=True):
+        return ValidationResult(passed=True, deed=None, closing_cost=None, errors=[])
+
+    monkeypatch.setattr(scheduler_module, "screen_document", lambda raw_text, verbose=True: None)
+    monkeypatch.setattr(scheduler_module, "extract_document", fake_extract)
+    monkeypatch.setattr(scheduler_module, "validate_extracted", fake_validate)
+    return state
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+class TestScheduler:
+    def test_earliest_deadline_runs_first(self, pipeline):
+        now = time.time()
+        with DeedScheduler(llm_workers=2, cpu_workers=1, reserved_llm=1) as scheduler:
+            # Hold the only backfill slot and the reserved slot so everything else queues
+            scheduler.submit("busy-1", deadline=now + 10)
+            scheduler.submit("busy-2", deadline=now + 10)
+            wait_until(lambda: len(pipeline["order"]) == 2)
+            futures = [
+                scheduler.submit("late", deadline=now + 300),
+                scheduler.submit("backfill"),
+                scheduler.submit("soon", deadline=now + 60),
+            ]
+            time.sleep(0.1)
+            pipeline["release"].set()
+            assert all(f.result(5).passed for f in futures)
+        assert pipeline["order"][2:] == ["soon", "late", "backfill"]
+
+    def test_backfill_never_takes_reserved_slot(self, pipeline):
+        with DeedScheduler(llm_workers=2, cpu_workers=1, reserved_llm=1) as scheduler:
+            scheduler.submit("backfill-1")
+            scheduler.submit("backfill-2")
+            wait_until(lambda: len(pipeline["order"]) == 1)
+            time.sleep(0.1)
+            assert pipeline["order"] == ["backfill-1"]
+
+            scheduler.submit("urgent", deadline=time.time() + 60)
+            wait_until(lambda: len(pipeline["order"]) == 2)
+            assert pipeline["order"][1] == "urgent"
+            pipeline["release"].set()
+
+    def test_backfill_deferred_when_urgent_deed_at_risk(self, pipeline):
+        with DeedScheduler(llm_workers=2, cpu_workers=1, reserved_llm=0) as scheduler:
+            scheduler._llm_estimate = 30.0
+            # Stuck behind screening, so not yet in the LLM queue but already at risk
+            scheduler._before_llm[-1] = scheduler_module._Task(-1, "pending", 0, time.time() + 30)
+            scheduler.submit("backfill-1")
+            scheduler.submit("backfill-2")
+            wait_until(lambda: len(pipeline["order"]) == 1)
+            time.sleep(0.1)
+            assert pipeline["order"] == ["backfill-1"]
+            del scheduler._before_llm[-1]
+            pipeline["release"].set()
+
+    def test_high_priority_without_deadline_is_urgent(self, pipeline):
+        with DeedScheduler(llm_workers=2, cpu_workers=1, reserved_llm=1, urgent_priority=5) as scheduler:
+            scheduler.submit("backfill")
+            wait_until(lambda: len(pipeline["order"]) == 1)
+            scheduler.submit("vip", priority=5)
+            wait_until(lambda: len(pipeline["order"]) == 2)
+            pipeline["release"].set()
+
+    def test_failures_become_results(self, pipeline, monkeypatch):
+        def failing_extract(raw_text, verbose=True):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(scheduler_module, "extract_document", failing_extract)
+        with DeedScheduler(llm_workers=1, cpu_workers=1, reserved_llm=0) as scheduler:
+            result = scheduler.submit("raw").result(5)
+        assert not result.passed
+        assert result.errors[0].error_type == "RuntimeError"
+
+    def test_metrics_split_wait_and_service(self, pipeline):
+        pipeline["release"].set()
+        with DeedScheduler(llm_workers=2, cpu_workers=1, reserved_llm=1) as scheduler:
+            scheduler.submit("urgent", deadline=time.time() + 60).result(5)
+            scheduler.submit("backfill").result(5)
+            metrics = scheduler.metrics()
+        assert {"extract/urgent", "extract/backfill", "total/urgent", "total/backfill"} <= set(metrics)
+        assert metrics["total/urgent"].count == 1
+        assert scheduler.completed == 2
+        assert scheduler.deadline_misses == 0
+
+    def test_reserved_slots_must_leave_room_for_backfill(self):
+        with pytest.raises(ValueError):
+            DeedScheduler(llm_workers=1, reserved_llm=1)
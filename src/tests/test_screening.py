@@ -0,0 +1,52 @@
+# Unit tests for pre-LLM screening of raw OCR text.
+
+import pytest
+from src.main import RAW_OCR_TEXT
+from src.validate.screening import screen_raw_text
+from src.validate.errors import AmountMismatchError, InvalidDateSequenceError, ValidationError
+
+VALID_TEXT = """Doc: DEED-TRUST-0043
+Date Signed: 2024-01-10
+Date Recorded: 2024-01-15
+Amount: $1,200,000.00 (One Million Two Hundred Thousand Dollars)"""
+
+
+def test_sample_deed_fails_with_both_errors():
+    with pytest.raises(ValidationError) as exc_info:
+        screen_raw_text(RAW_OCR_TEXT)
+    errors = exc_info.value.validation_errors
+    assert [type(e) for e in errors] == [InvalidDateSequenceError, AmountMismatchError]
+    assert "50,000" in str(errors[1])
+
+
+def test_valid_deed_passes():
+    screen_raw_text(VALID_TEXT)
+
+
+def test_date_error_alone():
+    with pytest.raises(InvalidDateSequenceError):
+        screen_raw_text(VALID_TEXT.replace("2024-01-15", "2024-01-01"))
+
+
+def test_conflicting_dates_are_inconclusive():
+    screen_raw_text(VALID_TEXT + "\nDate Recorded: 2023-12-01")
+
+
+def test_unreadable_values_are_inconclusive():
+    screen_raw_text(
+        "Date Signed: 2024-13-45\nDate Recorded: 2024-01-01\n"
+        "Amount: $1,250,000.00 (One Mi11ion Dollars)"
+    )
+
+
+def test_missing_fields_are_inconclusive():
+    screen_raw_text("Doc: DEED-1\nAmount: $500.00")
+
+
+@pytest.mark.parametrize("text", [
+    "Date Assigned: 2024-03-01\nDate Recorded: 2024-01-15",
+    "Unrecorded: 2024-03-01\nDate Signed: 2024-03-10",
+    VALID_TEXT.replace("Date Signed: 2024-01-10", "Date Assigned: 2024-03-01"),
+])
+def test_labels_must_be_whole_words(text):
+    screen_raw_text(text)
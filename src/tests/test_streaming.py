@@ -0,0 +1,199 @@
+# Unit tests for streaming extraction and checks on partial results.
+
+import json
+
+import pytest
+from src.llm import extractor
+from src.llm.streaming import IncrementalJSONParser
+from src.models import County
+from src.validate.errors import AmountMismatchError, InvalidDateSequenceError
+from src.validate import partial
+from src.validate.partial import PartialDeedChecker
+from src import main
+from src.dedup.index import StoreIndexes
+from src.enrich import county_resolver
+from src.llm import cascade
+from src.store.extractions import ExtractionStore
+from src.templates.induction import TemplateStore
+
+COUNTIES = [County(name="Santa Clara", tax_rate=0.012)]
+
+FULL_DATA = {
+    "doc": "DEED-TRUST-0042",
+    "county_raw": "S. Clara",
+    "state": "CA",
+    "date_signed": "2024-01-15",
+    "date_recorded": "2024-01-20",
+    "grantor": "T.E.S.L.A. Holdings LLC",
+    "grantee": "John \"Jack\" & Sarah Connor",
+    "amount_numeric": 1250000.0,
+    "amount_words": "One Million Two Hundred Fifty Thousand Dollars",
+    "apn": "992-001-XA",
+    "status": "PRELIMINARY",
+}
+
+
+@pytest.fixture
+def fresh_stores(tmp_path, monkeypatch):
+    # Keep the pipeline off the process-wide extraction, dedup and template singletons
+    store = ExtractionStore(str(tmp_path / "extractions.jsonl"))
+    indexes = StoreIndexes(store)
+    templates = TemplateStore(str(tmp_path / "templates.json"))
+    monkeypatch.setattr(main, "get_extraction_store", lambda: store)
+    monkeypatch.setattr(main, "get_dedup_indexes", indexes.sync)
+    monkeypatch.setattr(main, "get_template_store", lambda: templates)
+    return store
+
+
+def chunks(text: str, size: int = 7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class FakeStreamingClient:
+    def __init__(self, text: str):
+        self.text = text
+        self.sent = 0
+        self.closed = False
+
+    def stream_json(self, prompt, temperature=0.0):
+        try:
+            for chunk in chunks(self.text):
+                self.sent += len(chunk)
+                yield chunk
+        finally:
+            self.closed = True
+
+
+class TestIncrementalJSONParser:
+    def test_emits_each_field_once_complete(self):
+        parser = IncrementalJSONParser()
+        emitted = []
+        for chunk in chunks(json.dumps(FULL_DATA, indent=2)):
+            emitted.extend(parser.feed(chunk))
+        assert dict(emitted) == FULL_DATA
+        assert [field for field, _ in emitted] == list(FULL_DATA)
+        assert parser.complete
+
+    def test_number_waits_for_delimiter(self):
+        parser = IncrementalJSONParser()
+        assert parser.feed('{"amount_numeric": 12') == []
+        assert parser.feed('50}') == [("amount_numeric", 1250)]
+
+    def test_nested_values_and_literals(self):
+        parser = IncrementalJSONParser()
+        parser.feed('{"a": {"b": ["}", 1]}, "c": null, "d": true}')
+        assert parser.data == {"a": {"b": ["}", 1]}, "c": None, "d": True}
+
+    def test_truncated_stream_keeps_completed_fields(self):
+        parser = IncrementalJSONParser()
+        parser.feed('{"doc": "D-1", "apn": "99')
+        assert parser.data == {"doc": "D-1"}
+        assert not parser.complete
+
+    def test_invalid_json(self):
+        with pytest.raises(ValueError):
+            IncrementalJSONParser().feed('{"doc" "D-1"}')
+
+
+class TestPartialDeedChecker:
+    def test_resolves_county_on_arrival(self):
+        checker = PartialDeedChecker(COUNTIES)
+        assert checker.add("county_raw", "S. Clara") == []
+        assert checker.county[0] == "Santa Clara"
+
+    def test_date_failure_as_soon_as_both_dates_arrive(self):
+        checker = PartialDeedChecker(COUNTIES)
+        checker.add("date_signed", "2024-01-15")
+        errors = checker.add("date_recorded", "2024-01-10")
+        assert isinstance(errors[0], InvalidDateSequenceError)
+        assert checker.failed
+
+    def test_ill_typed_amount_is_not_judged(self):
+        checker = PartialDeedChecker(COUNTIES)
+        checker.add("amount_numeric", "1,250,000")
+        assert checker.add("amount_words", "One Million") == []
+
+
+class TestStreamingExtraction:
+    def test_full_stream_builds_deed(self, monkeypatch):
+        client = FakeStreamingClient(json.dumps(FULL_DATA))
+        monkeypatch.setattr(extractor, "get_llm_client", lambda: client)
+        seen = []
+
+        deed = extractor.extract_deed_fields_streaming("raw", on_field=lambda f, v: seen.append(f))
+
+        assert deed.grantee == FULL_DATA["grantee"]
+        assert seen == list(FULL_DATA)
+        assert client.closed
+
+    def test_certain_failure_cancels_stream(self, monkeypatch, fresh_stores):
+        data = dict(FULL_DATA, amount_words="One Million Dollars")
+        client = FakeStreamingClient(json.dumps(data))
+        monkeypatch.setattr(extractor, "get_llm_client", lambda: client)
+
+        with pytest.raises(AmountMismatchError):
+            main.extract_document("raw", verbose=False, stream=True, cascade=False)
+
+        assert client.closed
+        assert client.sent < len(json.dumps(data))
+        assert fresh_stores.size() == 0
+
+    def test_county_is_resolved_once(self, monkeypatch, fresh_stores):
+        client = FakeStreamingClient(json.dumps(FULL_DATA))
+        monkeypatch.setattr(extractor, "get_llm_client", lambda: client)
+        calls = []
+
+        def counting(resolve):
+            def wrapper(*args, **kwargs):
+                calls.append(args[0])
+                return resolve(*args, **kwargs)
+            return wrapper
+
+        monkeypatch.setattr(partial, "resolve_county", counting(partial.resolve_county))
+        monkeypatch.setattr(county_resolver, "resolve_county", counting(county_resolver.resolve_county))
+
+        result = main.validate_deed_document("raw", verbose=False, stream=True, cascade=False)
+
+        assert result.deed.county_raw == FULL_DATA["county_raw"]
+        assert calls == [FULL_DATA["county_raw"]]
+
+
+class FakeClient:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def extract_json(self, prompt, temperature=0.0):
+        self.prompts.append(prompt)
+        return self.responses.pop(0), {}
+
+
+class TestCancelledReadCascade:
+    def test_corrected_read_is_completed_not_re_extracted(self, monkeypatch):
+        misread = dict(FULL_DATA, amount_words="One Million Dollars")
+
+        def cancelled_stream(raw_text, on_field=None):
+            for field, value in misread.items():
+                on_field(field, value)
+
+        def full_extraction(raw_text):
+            raise AssertionError("full re-extraction")
+
+        amounts = {"amount_numeric": FULL_DATA["amount_numeric"], "amount_words": FULL_DATA["amount_words"]}
+        client = FakeClient([amounts, {"amount_words": FULL_DATA["amount_words"]},
+                             {"apn": FULL_DATA["apn"], "status": FULL_DATA["status"]}])
+        monkeypatch.setattr(main, "extract_deed_fields_streaming", cancelled_stream)
+        monkeypatch.setattr(main, "extract_deed_fields", full_extraction)
+        monkeypatch.setattr(cascade, "get_llm_client", lambda model=None: client)
+        monkeypatch.setattr(extractor, "get_llm_client", lambda model=None: client)
+
+        deed, report = main._extract_with_llm("raw", verbose=False, stream=True, cascade=True)
+
+        assert deed.amount_words == FULL_DATA["amount_words"]
+        assert deed.apn == FULL_DATA["apn"]
+        assert report.corrected == ["amount_words"]
+        assert client.responses == []
+
+        # The later cascade pass does not re-read what the stronger model already read
+        _, again = cascade.run_cascade("raw", deed, COUNTIES, client=FakeClient([]), settled=report.suspects)
+        assert again.escalated_calls == 0
@@ -0,0 +1,157 @@
+# Unit tests for layout template induction.
+
+import threading
+
+from src.config import TEMPLATE_AUDIT_EVERY, TEMPLATE_MIN_OBSERVATIONS
+from src.main import RAW_OCR_TEXT
+from src.models import ExtractedDeed
+from src.store.extractions import ExtractionStore
+from src.templates.induction import TemplateStore, align, apply_template, is_trusted
+from src.templates.layout import layout_fingerprint, segments
+
+SAMPLE_DEED = ExtractedDeed(
+    doc="DEED-TRUST-0042", county_raw="S. Clara", state="CA",
+    date_signed="2024-01-15", date_recorded="2024-01-10",
+    grantor="T.E.S.L.A. Holdings LLC", grantee="John & Sarah Connor",
+    amount_numeric=1_250_000.0, amount_words="One Million Two Hundred Thousand Dollars",
+    apn="992-001-XA", status="PRELIMINARY",
+)
+
+OTHER_TEXT = RAW_OCR_TEXT.replace("0042", "0077").replace("992-001-XA", "123-456-ZZ")
+OTHER_DEED = SAMPLE_DEED.model_copy(update={"doc": "DEED-TRUST-0077", "apn": "123-456-ZZ"})
+
+
+def trained_store(tmp_path) -> TemplateStore:
+    store = TemplateStore(str(tmp_path / "templates.json"))
+    # The first observation only creates the template
+    for _ in range(TEMPLATE_MIN_OBSERVATIONS + 1):
+        store.observe(RAW_OCR_TEXT, SAMPLE_DEED)
+    return store
+
+
+def test_segments_split_on_pipes():
+    assert ("county", "S. Clara") in segments(RAW_OCR_TEXT)
+    assert ("state", "CA") in segments(RAW_OCR_TEXT)
+
+
+def test_fingerprint_ignores_values():
+    assert layout_fingerprint(RAW_OCR_TEXT) == layout_fingerprint(OTHER_TEXT)
+    assert layout_fingerprint(RAW_OCR_TEXT) != layout_fingerprint("Doc: X\nParcel: Y")
+
+
+def test_align_learns_label_and_span():
+    rules = align(RAW_OCR_TEXT, SAMPLE_DEED)
+    assert rules["date_signed"].label == "date signed"
+    assert rules["amount_numeric"].kind == "money"
+    assert rules["amount_words"].kind == "paren"
+    assert rules["grantee"].kind == "text"
+
+
+def test_trusted_template_extracts_new_deed_locally(tmp_path):
+    store = trained_store(tmp_path)
+    deed, template = store.extract(OTHER_TEXT)
+    assert is_trusted(template)
+    assert deed.doc == "DEED-TRUST-0077"
+    assert deed.apn == "123-456-ZZ"
+    assert deed.amount_numeric == 1_250_000.0
+
+
+def test_trust_needs_min_observations_of_comparisons(tmp_path):
+    store = TemplateStore(str(tmp_path / "templates.json"))
+    template = store.observe(RAW_OCR_TEXT, SAMPLE_DEED)
+    assert template.observations == template.agreements == 0
+    for _ in range(TEMPLATE_MIN_OBSERVATIONS - 1):
+        store.observe(RAW_OCR_TEXT, SAMPLE_DEED)
+    assert not is_trusted(template)
+    store.observe(RAW_OCR_TEXT, SAMPLE_DEED)
+    assert is_trusted(template)
+
+
+def test_untrained_layout_falls_back(tmp_path):
+    store = TemplateStore(str(tmp_path / "templates.json"))
+    store.observe(RAW_OCR_TEXT, SAMPLE_DEED)
+    assert store.extract(OTHER_TEXT) is None
+
+
+def test_missing_anchor_falls_back(tmp_path):
+    store = trained_store(tmp_path)
+    template = store.templates[layout_fingerprint(RAW_OCR_TEXT)]
+    assert apply_template(template, RAW_OCR_TEXT.replace("APN: 992-001-XA", "APN:")) is None
+
+
+def test_disagreement_lowers_trust(tmp_path):
+    store = trained_store(tmp_path)
+    misread = OTHER_DEED.model_copy(update={"grantor": "Someone Else"})
+    template = store.observe(OTHER_TEXT, misread)
+    assert template.agreements == template.observations - 1
+    assert not is_trusted(template)
+
+
+def test_sampled_audit_goes_to_llm(tmp_path):
+    store = trained_store(tmp_path)
+    results = [store.extract(OTHER_TEXT) for _ in range(TEMPLATE_AUDIT_EVERY)]
+    assert results[-1] is None
+    assert all(r is not None for r in results[:-1])
+
+
+def test_save_skips_unchanged_store(tmp_path):
+    store = trained_store(tmp_path)
+    store.save()
+    store.path.unlink()
+    store.extract(OTHER_TEXT)
+    store.save()
+    assert not store.path.exists()
+
+
+def test_store_round_trip(tmp_path):
+    store = trained_store(tmp_path)
+    store.save()
+    reloaded = TemplateStore(str(tmp_path / "templates.json"))
+    assert reloaded.extract(OTHER_TEXT) is not None
+
+
+def test_templates_follow_the_extraction_store(tmp_path):
+    extractions = ExtractionStore(str(tmp_path / "extractions.jsonl"))
+    mine = TemplateStore(str(tmp_path / "templates.json"))
+    # LLM extractions made by other worker processes
+    for _ in range(TEMPLATE_MIN_OBSERVATIONS + 1):
+        extractions.append(RAW_OCR_TEXT, SAMPLE_DEED)
+    extractions.append(OTHER_TEXT, OTHER_DEED, source="template")
+
+    mine.sync(extractions)
+    assert mine.extract(OTHER_TEXT) is not None
+
+    mine.save()
+    reloaded = TemplateStore(str(tmp_path / "templates.json"))
+    reloaded.sync(extractions)
+    template = reloaded.templates[layout_fingerprint(RAW_OCR_TEXT)]
+    assert template.observations == TEMPLATE_MIN_OBSERVATIONS
+
+
+def test_concurrent_observe_and_save(tmp_path):
+    store = TemplateStore(str(tmp_path / "templates.json"))
+    errors = []
+
+    def observe_layouts(worker):
+        try:
+            for i in range(50):
+                store.observe(RAW_OCR_TEXT + f"\nNote {worker}-{i}: x", SAMPLE_DEED)
+        except Exception as e:
+            errors.append(e)
+
+    def save_repeatedly():
+        try:
+            for _ in range(50):
+                store.dirty = True
+                store.save()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=observe_layouts, args=(w,)) for w in range(3)]
+    threads.append(threading.Thread(target=save_repeatedly))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(store.templates) == 150
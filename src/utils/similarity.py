@@ -1,5 +1,6 @@
 # String similarity utilities for fuzzy matching, Uses Python's built-in difflib for fuzzy string matching, No external dependencies needed.
 
+import re
 from difflib import SequenceMatcher
 from typing import List, Tuple
 
@@ -27,3 +28,12 @@ def find_best_match(
         return None, 0.0
 
     return best_match, best_score
+
+
+def values_agree(a, b) -> bool:
+    # Two extracted values agree: numbers to the cent, strings up to whitespace.
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return abs(a - b) < 0.005
+    if isinstance(a, str) and isinstance(b, str):
+        return re.sub(r'\s+', ' ', a).strip() == re.sub(r'\s+', ' ', b).strip()
+    return False
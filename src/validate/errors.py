@@ -11,3 +11,11 @@ class ExtractionError(ValidationError):
     pass
 class MissingFieldError(ValidationError):
     pass
+class DuplicateRecordingError(ValidationError):
+    pass
+class TaxRateError(ValidationError):
+    pass
+class ReadDisagreementError(ExtractionError):
+    pass
+class LLMServiceError(ExtractionError):
+    pass
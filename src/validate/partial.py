@@ -0,0 +1,58 @@
+# Deterministic checks over a partially streamed extraction, run as soon as their inputs arrive.
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.enrich.county_resolver import resolve_county
+from src.models import County
+from src.validate.errors import ValidationError
+from src.validate.rules import validate_amount_consistency, validate_date_sequence
+
+
+class PartialDeedChecker:
+    def __init__(self, counties: List[County]):
+        self.counties = counties
+        self.fields: Dict[str, Any] = {}
+        self.errors: List[ValidationError] = []
+        self.county: Optional[Tuple[str, float, float]] = None
+        self._checked = set()
+
+    @property
+    def failed(self) -> bool:
+        # A hard failure is certain: the remaining fields cannot make this deed pass.
+        return bool(self.errors)
+
+    def county_for(self, county_raw: str) -> Optional[Tuple[str, float, float]]:
+        # The early county resolution, if it was made for this spelling (the cascade may have changed it).
+        return self.county if self.fields.get("county_raw") == county_raw else None
+
+    def add(self, field: str, value: Any) -> List[ValidationError]:
+        # Record a completed field and return any errors it made certain.
+        self.fields[field] = value
+        found = []
+
+        if "county" not in self._checked and isinstance(self.fields.get("county_raw"), str):
+            self._checked.add("county")
+            try:
+                self.county = resolve_county(self.fields["county_raw"], self.counties)
+            except ValidationError as e:
+                found.append(e)
+
+        signed, recorded = self.fields.get("date_signed"), self.fields.get("date_recorded")
+        if "dates" not in self._checked and isinstance(signed, str) and isinstance(recorded, str):
+            self._checked.add("dates")
+            try:
+                validate_date_sequence(signed, recorded)
+            except ValidationError as e:
+                found.append(e)
+
+        numeric, words = self.fields.get("amount_numeric"), self.fields.get("amount_words")
+        # An ill-typed amount is left for the repair pass rather than judged here
+        if "amount" not in self._checked and isinstance(numeric, (int, float)) and isinstance(words, str):
+            self._checked.add("amount")
+            try:
+                validate_amount_consistency(float(numeric), words)
+            except ValidationError as e:
+                found.append(e)
+
+        self.errors.extend(found)
+        return found
@@ -42,6 +42,11 @@ def validate_deed(date_signed: str, date_recorded: str, amount_numeric: float, a
         errors.append(e)
 
 
+    raise_collected(errors)
+
+
+def raise_collected(errors) -> None:
+    # Raise nothing, the single error, or one ValidationError carrying all of them.
     if errors:
         if len(errors) == 1:
             raise errors[0]
@@ -0,0 +1,62 @@
+# Pre-LLM screening: reject deeds whose raw OCR text already proves a bad date sequence or amount.
+
+import re
+from typing import List, Optional, TypeVar
+
+from src.utils.dates import parse_date
+from src.utils.money_words import parse_money_words
+from src.validate.errors import ValidationError
+from src.validate.rules import raise_collected, validate_amount_consistency, validate_date_sequence
+
+# Only year-first dates are read here; ambiguous forms like 01/02/2024 are left to the LLM
+_ISO_DATE = r'(\d{4}[-/]\d{1,2}[-/]\d{1,2})'
+# Whole-word labels only: "Date Assigned" is not a signing date
+_DATE_SIGNED = re.compile(r'\b(?:date\s+)?signed\b(?:\s+on\b)?\s*[:\-]?\s*' + _ISO_DATE, re.IGNORECASE)
+_DATE_RECORDED = re.compile(r'\b(?:date\s+)?recorded\b(?:\s+on\b)?\s*[:\-]?\s*' + _ISO_DATE, re.IGNORECASE)
+_AMOUNT = re.compile(r'\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{1,2})?|\d+(?:\.\d{1,2})?)\s*\(([^()]*)\)')
+
+
+T = TypeVar("T")
+
+
+def _single(values: List[T]) -> Optional[T]:
+    # The one distinct value found, or None when the text is missing it or contradicts itself.
+    distinct = set(values)
+    return distinct.pop() if len(distinct) == 1 else None
+
+
+def screen_raw_text(raw_text: str) -> None:
+    """
+    Run the date and amount checks on values read straight from the OCR text.
+    Raises only when the evidence is unambiguous; anything unclear is left for the LLM path.
+    """
+    errors = []
+
+    date_signed = _single(_DATE_SIGNED.findall(raw_text))
+    date_recorded = _single(_DATE_RECORDED.findall(raw_text))
+    if date_signed and date_recorded:
+        try:
+            parse_date(date_signed)
+            parse_date(date_recorded)
+        except ValueError:
+            pass  # a date that does not parse is not proof of a bad deed
+        else:
+            try:
+                validate_date_sequence(date_signed, date_recorded)
+            except ValidationError as e:
+                errors.append(e)
+
+    amount = _single(_AMOUNT.findall(raw_text))
+    if amount:
+        numeric, words = amount
+        try:
+            parse_money_words(words)
+        except ValueError:
+            pass
+        else:
+            try:
+                validate_amount_consistency(float(numeric.replace(',', '')), words)
+            except ValidationError as e:
+                errors.append(e)
+
+    raise_collected(errors)